@@ -1,68 +1,210 @@
+import asyncio
 import os
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Union
 
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
 
-from utils.data_loader import load_stackoverflow_data
-from utils.evaluation import QAEvaluator
-from utils.llm_chain import LLMChain
-from utils.vector_store import VectorStore
+from utils.languages import AUTO_LANGUAGE, LANGUAGES
+from utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from utils.evaluation import QAEvaluator
+    from utils.llm_chain import LLMChain
+    from utils.qa_service import QAService
+    from utils.service_client import QAServiceClient
+    from utils.vector_store import VectorStore
 
 # 환경 변수 로드
 load_dotenv()
 
+# 평가 질문 파일이 없을 때 사용할 기본 질문
+DEFAULT_EVAL_QUESTIONS_PATH = "data/eval_questions.csv"
+# 평가 시 동시에 처리할 최대 질문 수 (임베딩/LLM 요청 동시 실행 제한)
+EVAL_CONCURRENCY = int(os.getenv("QA_EVAL_CONCURRENCY", "16"))
+DEFAULT_EVAL_QUESTIONS = [
+    {"question": "C#에서 문자열을 다루는 방법은?", "language": "c#"},
+    {"question": "LINQ란 무엇인가요?", "language": "c#"},
+    {"question": "async/await의 사용법은?", "language": "c#"},
+]
+
+Service = Union["QAService", "QAServiceClient"]
+
+# 검색/답변 생성에 실패했을 때 AI 답변 자리에 표시할 문구
+ERROR_ANSWER = "죄송합니다. 답변을 생성하는 중에 오류가 발생했습니다."
+
+# 사이드바 언어 선택지 (자동 감지는 모든 언어 인덱스를 검색하여 언어를 고름)
+LANGUAGE_OPTIONS = {"자동 감지": AUTO_LANGUAGE, **{lang: lang for lang in LANGUAGES}}
+
+
+# 지연 로딩 컴포넌트
+# LangChain/OpenAI/FAISS/RAGAS 등 무거운 모듈은 실제로 필요한 시점에 처음 불러오고,
+# 생성된 객체는 st.cache_resource로 캐싱하여 재실행(rerun)마다 다시 만들지 않는다.
+
 
 @st.cache_resource
-def initialize_vector_stores() -> Dict[str, VectorStore]:
+def initialize_vector_stores() -> Dict[str, "VectorStore"]:
     """
     각 언어별 벡터 스토어 초기화 (캐싱)
     """
-    embeddings = OpenAIEmbeddings()
-    vector_stores = {}
-    languages = ["c#", "javascript", "java"]
+    from langchain_openai import OpenAIEmbeddings
+
+    from utils.vector_store import build_vector_stores
+
+    return build_vector_stores(OpenAIEmbeddings(), LANGUAGES)
+
+
+@st.cache_resource
+def get_llm_chain() -> "LLMChain":
+    """
+    LLM 체인 (캐싱)
+    """
+    from utils.llm_chain import LLMChain
 
-    for lang in languages:
-        vector_store = VectorStore(embeddings)
-        index_path = f"faiss_index_{lang}"
+    return LLMChain()
 
-        # 저장된 벡터 스토어가 있으면 로드
-        if os.path.exists(index_path):
-            vector_store.load_vectorstore(index_path)
-        else:
-            # 데이터 로드 및 벡터 스토어 생성
-            df = load_stackoverflow_data(f"data/stackoverflow_{lang}_qa.csv")
-            vector_store.create_vectorstore(df)
-            vector_store.save_vectorstore(index_path)
 
-        vector_stores[lang] = vector_store
+@st.cache_resource
+def get_evaluator() -> "QAEvaluator":
+    """
+    RAGAS 평가기 (캐싱, 평가 탭에서 처음 사용할 때 로드)
+    """
+    from utils.evaluation import QAEvaluator
 
-    return vector_stores
+    return QAEvaluator()
 
 
-def process_question(
-    question: str,
-    language: str,
-    vector_stores: Dict[str, VectorStore],
-    llm_chain: LLMChain,
+@st.cache_resource
+def get_local_service() -> "QAService":
+    """
+    로컬 검색 + 답변 생성 파이프라인 (캐싱)
+    """
+    from utils.qa_service import QAService
+
+    return QAService(initialize_vector_stores(), get_llm_chain())
+
+
+@st.cache_resource
+def get_service_client(base_url: str) -> "QAServiceClient":
+    """
+    원격 QA 서비스 클라이언트 (캐싱하여 연결 재사용)
+    """
+    from utils.service_client import QAServiceClient
+
+    return QAServiceClient(base_url)
+
+
+def get_service() -> Service:
+    """
+    QA_SERVICE_URL이 설정되어 있으면 원격 서비스 클라이언트를,
+    아니면 로컬 파이프라인을 반환
+    """
+    service_url = os.getenv("QA_SERVICE_URL")
+    if service_url:
+        return get_service_client(service_url)
+    return get_local_service()
+
+
+async def aprocess_question(
+    question: str, language: str, service: Service
 ) -> Tuple[List[Dict], str]:
     """
-    사용자 질문 처리
+    사용자 질문 비동기 처리 (여러 질문을 하나의 이벤트 루프에서 동시에 처리)
+    """
+    try:
+        return await service.aprocess_question(question, language)
+    except Exception as e:
+        print(f"질문 처리 중 오류 발생: {str(e)}")
+        return [], ERROR_ANSWER
+
+
+async def aprocess_questions(
+    questions: List[str],
+    languages: List[str],
+    service: Service,
+    max_concurrency: int = EVAL_CONCURRENCY,
+) -> List[Tuple[List[Dict], str]]:
+    """
+    여러 질문을 동시에 처리
+
+    LLMChain의 세마포어는 답변 생성만 제한하므로, 질문 수천 개를 불러와도
+    임베딩 요청이 한꺼번에 나가지 않도록 질문 단위 처리 전체를 제한한다.
+
+    Args:
+        max_concurrency: 동시에 처리할 최대 질문 수 (검색 + 답변 생성)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(question: str, language: str) -> Tuple[List[Dict], str]:
+        async with semaphore:
+            return await aprocess_question(question, language, service)
+
+    return await asyncio.gather(
+        *[
+            bounded(question, language)
+            for question, language in zip(questions, languages)
+        ]
+    )
+
+
+def get_evaluation_questions(uploaded_file) -> List[Dict[str, str]]:
+    """
+    평가 질문 목록 결정 (업로드 파일 > 기본 평가 파일 > 기본 질문 순)
+    """
+    from utils.evaluation import load_evaluation_questions, parse_evaluation_questions
+
+    if uploaded_file is not None:
+        try:
+            # 엑셀에서 저장한 CSV의 BOM 제거
+            content = uploaded_file.getvalue().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ValueError("평가 질문 파일은 UTF-8로 인코딩되어야 합니다.")
+        return parse_evaluation_questions(
+            content, os.path.splitext(uploaded_file.name)[1]
+        )
+    if os.path.exists(DEFAULT_EVAL_QUESTIONS_PATH):
+        return load_evaluation_questions(DEFAULT_EVAL_QUESTIONS_PATH)
+    return DEFAULT_EVAL_QUESTIONS
+
+
+def start_answer(
+    question: str, language: str, service: Service, stats: Dict[str, float]
+) -> Tuple[List[Dict], Iterator[str]]:
     """
+    유사 질문 검색 후 답변 스트림 시작 (검색 결과를 스트리밍 답변보다 먼저 표시)
+
+    원격 서비스에서는 답변 스트림의 첫 이벤트로 검색 결과를 받으므로 검색 요청을
+    따로 보내지 않는다.
+    """
+    try:
+        similar_results, token_stream = service.retrieve_and_stream(
+            question, language, stats
+        )
+    except Exception as e:
+        st.error(f"오류가 발생했습니다: {str(e)}")
+        return [], iter([ERROR_ANSWER])
+    return similar_results, guard_stream(token_stream)
+
+
+def guard_stream(token_stream: Iterator[str]) -> Iterator[str]:
+    """스트리밍 중 오류(연결 끊김 등)를 traceback 대신 안내 메시지로 표시"""
     try:
-        vector_store = vector_stores[language]
-        similar_results = vector_store.get_similar_questions(question)
-        llm_response = llm_chain.generate_response(question, similar_results, language)
-        return similar_results, llm_response
+        yield from token_stream
     except Exception as e:
         st.error(f"오류가 발생했습니다: {str(e)}")
-        return [], "죄송합니다. 답변을 생성하는 중에 오류가 발생했습니다."
+        yield f"\n\n{ERROR_ANSWER}"
 
 
-def display_results(user_question: str, similar_results: List[Dict], llm_answer: str):
+def display_results(
+    user_question: str,
+    similar_results: List[Dict],
+    llm_answer: Union[str, Iterator[str]],
+) -> str:
     """
     검색 결과 표시
+
+    llm_answer가 토큰 이터레이터이면 AI 답변을 점진적으로 스트리밍하고,
+    최종 답변 문자열을 반환
     """
     st.write("### 📝 사용자 질문")
     st.write(user_question)
@@ -85,7 +227,59 @@ def display_results(user_question: str, similar_results: List[Dict], llm_answer:
             st.write(f"**유사도 : {level}")  # 유사도 점수와 수준 표시
 
     st.write("### 💡 AI 답변")
-    st.write(llm_answer)
+    if isinstance(llm_answer, str):
+        st.write(llm_answer)
+        return llm_answer
+    return st.write_stream(llm_answer)
+
+
+def display_metrics():
+    """
+    단계별 지연 시간(p50/p95/p99) 표시 및 내보내기
+    """
+    st.subheader("단계별 지연 시간 ⏱️")
+    snapshot = metrics.snapshot()
+    if not snapshot["stages"]:
+        st.caption("아직 수집된 지표가 없습니다.")
+        return
+
+    st.table(
+        [
+            {
+                "단계": stage,
+                "호출 수": values["count"],
+                "p50(초)": round(values["p50"], 3),
+                "p95(초)": round(values["p95"], 3),
+                "p99(초)": round(values["p99"], 3),
+            }
+            for stage, values in snapshot["stages"].items()
+        ]
+    )
+
+    counters = snapshot["counters"]
+    if counters.get("gate.decisions"):
+        avoided = counters.get("gate.llm_calls_avoided", 0) / counters["gate.decisions"]
+        st.caption(f"신뢰도 게이트로 생략한 LLM 호출 비율: {avoided:.0%}")
+
+    if counters:
+        st.table(
+            [
+                {"지표": name, "값": int(value)}
+                for name, value in counters.items()
+            ]
+        )
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        "Prometheus 형식으로 내보내기",
+        metrics.export_prometheus(),
+        file_name="qa_metrics.prom",
+    )
+    col2.download_button(
+        "JSON 형식으로 내보내기",
+        metrics.export_json(),
+        file_name="qa_metrics.json",
+    )
 
 
 def main():
@@ -94,11 +288,6 @@ def main():
     # 탭 생성
     tab1, tab2 = st.tabs(["챗봇", "시스템 평가"])
 
-    # 컴포넌트 초기화
-    vector_stores = initialize_vector_stores()
-    llm_chain = LLMChain()
-    evaluator = QAEvaluator()
-
     with tab1:
         st.title("프로그래밍 Q&A 챗봇 🤖")
 
@@ -115,53 +304,93 @@ def main():
             )
 
             # 언어 선택
-            language = st.selectbox(
-                "프로그래밍 언어를 선택하세요:", ["c#", "javascript", "java"]
+            language_label = st.selectbox(
+                "프로그래밍 언어를 선택하세요:", list(LANGUAGE_OPTIONS)
             )
+            language = LANGUAGE_OPTIONS[language_label]
 
         # 사용자 입력
+        subject = "프로그래밍" if language == AUTO_LANGUAGE else language
+        example = LANGUAGES[0] if language == AUTO_LANGUAGE else language
         user_question = st.text_input(
-            f"{language} 관련 질문을 입력하세요:",
-            placeholder=f"예: {language}에서 문자열을 다루는 방법은?",
+            f"{subject} 관련 질문을 입력하세요:",
+            placeholder=f"예: {example}에서 문자열을 다루는 방법은?",
         )
 
         if user_question:
-            with st.spinner("답변을 찾는 중..."):
-                similar_results, llm_response = process_question(
-                    user_question, language, vector_stores, llm_chain
+            service = get_service()
+            # 검색 결과는 즉시 표시하고 AI 답변은 토큰 단위로 스트리밍
+            # (같은 질문의 답변이 이미 생성 중이면 그 스트림을 함께 구독)
+            generation_stats = {}
+            with st.spinner("유사한 질문을 찾는 중..."):
+                similar_results, token_stream = start_answer(
+                    user_question, language, service, generation_stats
                 )
-                display_results(user_question, similar_results, llm_response)
+
+            if language == AUTO_LANGUAGE and similar_results:
+                st.caption(f"감지된 언어: {similar_results[0]['language']}")
+
+            display_results(user_question, similar_results, token_stream)
+
+            if generation_stats:
+                st.caption(
+                    f"첫 토큰까지 {generation_stats['time_to_first_token']:.2f}초 · "
+                    f"전체 생성 {generation_stats['total_time']:.2f}초"
+                )
+                st.session_state.setdefault("generation_stats", []).append(
+                    {
+                        "question": user_question,
+                        "language": language,
+                        **generation_stats,
+                    }
+                )
+            else:
+                st.caption("동일한 질문에 대해 진행 중이던 답변을 공유했습니다.")
 
     with tab2:
         st.title("시스템 평가 📊")
+        uploaded_file = st.file_uploader(
+            "평가 질문 파일 (question[, language] 컬럼의 CSV, JSONL 또는 TXT)",
+            type=["csv", "jsonl", "txt"],
+        )
         if st.button("시스템 평가 실행"):
             with st.spinner("시스템 성능을 평가하는 중..."):
-                # 테스트 데이터 준비
-                test_questions = [
-                    "C#에서 문자열을 다루는 방법은?",
-                    "LINQ란 무엇인가요?",
-                    "async/await의 사용법은?",
+                service = get_service()
+                evaluator = get_evaluator()
+
+                # 테스트 데이터 준비 (언어가 없으면 c#으로 평가)
+                try:
+                    eval_items = get_evaluation_questions(uploaded_file)
+                except ValueError as e:
+                    st.error(f"평가 질문 파일을 읽을 수 없습니다: {str(e)}")
+                    st.stop()
+                if not eval_items:
+                    st.error("평가 질문 파일에 질문이 없습니다.")
+                    st.stop()
+                test_questions = [item["question"] for item in eval_items]
+                test_languages = [item["language"] or "c#" for item in eval_items]
+
+                # 각 질문에 대한 답변과 컨텍스트를 동시에 수집
+                processed = asyncio.run(
+                    aprocess_questions(test_questions, test_languages, service)
+                )
+                test_answers = [llm_response for _, llm_response in processed]
+                test_contexts = [
+                    [r["answer"] for r in similar_results]
+                    for similar_results, _ in processed
                 ]
 
-                # 각 질문에 대한 답변과 컨텍스트 수집
-                test_answers = []
-                test_contexts = []
-
-                for question in test_questions:
-                    similar_results, llm_response = process_question(
-                        question, "c#", vector_stores, llm_chain
-                    )
-                    test_answers.append(llm_response)
-                    test_contexts.append([r["answer"] for r in similar_results])
-
                 # 평가 실행
                 eval_results = evaluator.evaluate_qa_system(
                     test_questions, test_answers, test_contexts
                 )
 
                 # 평가 보고서 표시
+                st.caption(f"평가 질문 {len(test_questions)}개")
                 st.markdown(evaluator.generate_evaluation_report(eval_results))
 
+        display_metrics()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,175 @@
+"""
+QA 말뭉치 표현별 문서당 메모리 비교
+
+같은 전처리 결과를 pandas DataFrame, QAData 리스트, LangChain Document + 메타데이터,
+CompactCorpus로 만들었을 때 유지되는 메모리와 CompactCorpus 저장/로드 시간을 측정한다.
+
+사용 예:
+    python benchmark_corpus_memory.py --csv data/stackoverflow_java_qa.csv
+    python benchmark_corpus_memory.py --size 20000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from langchain.schema import Document
+
+from utils.before_data_processor import QAData
+from utils.compact_corpus import CompactCorpus
+from utils.data_loader import load_stackoverflow_data
+from utils.stub_backends import make_synthetic_qa_frame
+
+
+def _traced_bytes(build) -> Tuple[object, int]:
+    """build()가 만든 객체가 유지하는 메모리를 tracemalloc으로 측정"""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    if not tracing:
+        tracemalloc.stop()
+    return value, size
+
+
+def representation_memory(df) -> Dict[str, Dict[str, float]]:
+    """
+    같은 말뭉치를 기존 표현들과 CompactCorpus로 만들었을 때의 메모리 비교
+
+    Args:
+        df: question_title, clean_answer, question_link 컬럼의 전처리된 DataFrame
+    Returns:
+        {표현 이름: {"bytes": 총 바이트, "bytes_per_doc": 문서당 바이트}}
+    """
+    count = max(len(df), 1)
+    titles = list(df["question_title"])
+    answers = list(df["clean_answer"])
+    links = list(df["question_link"])
+
+    def copy_strings(values: List[str]) -> List[str]:
+        # 원본 DataFrame의 문자열 객체를 공유하지 않도록 새 문자열 생성
+        return [str(value).encode("utf-8").decode("utf-8") for value in values]
+
+    def build_frame():
+        return pd.DataFrame(
+            {
+                "question_title": copy_strings(titles),
+                "question_link": copy_strings(links),
+                "clean_answer": copy_strings(answers),
+            }
+        )
+
+    def build_qa_data():
+        return [
+            QAData(question=title, answer=answer)
+            for title, answer in zip(copy_strings(titles), copy_strings(answers))
+        ]
+
+    def build_documents():
+        # 기존 create_vectorstore: 검색 텍스트 + 모든 필드를 복제한 메타데이터
+        return [
+            Document(
+                page_content=f"{title}\n{answer}",
+                metadata={
+                    "question_title": title,
+                    "clean_answer": answer,
+                    "question_link": link,
+                },
+            )
+            for title, answer, link in zip(
+                copy_strings(titles), copy_strings(answers), copy_strings(links)
+            )
+        ]
+
+    report = {}
+    for name, build in (
+        ("pandas.DataFrame", build_frame),
+        ("QAData list", build_qa_data),
+        ("Document + metadata", build_documents),
+        ("CompactCorpus", lambda: CompactCorpus.from_frame(df)),
+    ):
+        value, size = _traced_bytes(build)
+        if name == "pandas.DataFrame":
+            # 블록 배열은 tracemalloc 밖에서 할당될 수 있으므로 pandas 측정값과 비교
+            size = max(size, int(value.memory_usage(deep=True).sum()))
+        report[name] = {"bytes": size, "bytes_per_doc": size / count}
+        del value
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="말뭉치 표현별 메모리 비교")
+    parser.add_argument("--csv", help="측정할 스택오버플로우 CSV (없으면 합성 데이터)")
+    parser.add_argument("--size", type=int, default=5000, help="합성 문서 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON 보고서 저장 경로")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = args.csv
+        if not csv_path:
+            csv_path = os.path.join(workdir, "synthetic.csv")
+            frame = make_synthetic_qa_frame("java", args.size, args.seed)
+            frame.to_csv(csv_path, index=False)
+        df = load_stackoverflow_data(csv_path)
+
+        memory = representation_memory(df)
+
+        corpus = CompactCorpus.from_frame(df)
+        start = time.perf_counter()
+        corpus.save(workdir)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = CompactCorpus.load(workdir)
+        load_seconds = time.perf_counter() - start
+
+        # 임의 접근 시간 (레코드 하나를 문자열로 디코딩)
+        start = time.perf_counter()
+        for doc_id in range(len(loaded)):
+            loaded.result(doc_id, 0.0)
+        access_seconds = (time.perf_counter() - start) / max(len(loaded), 1)
+
+    report = {
+        "documents": len(df),
+        "representations": memory,
+        "compact_corpus": {
+            "save_seconds": save_seconds,
+            "load_seconds": load_seconds,
+            "record_access_seconds": access_seconds,
+        },
+    }
+
+    baseline = memory["CompactCorpus"]["bytes_per_doc"] or 1
+    print(f"문서 수: {len(df)}")
+    print(f"{'표현':<24}{'총(MB)':>10}{'문서당(B)':>12}{'배율':>8}")
+    for name, values in memory.items():
+        print(
+            f"{name:<24}{values['bytes'] / 1024 / 1024:>10.2f}"
+            f"{values['bytes_per_doc']:>12.0f}"
+            f"{values['bytes_per_doc'] / baseline:>8.1f}x"
+        )
+    print(
+        f"CompactCorpus 저장 {save_seconds * 1000:.1f}ms, "
+        f"로드(mmap) {load_seconds * 1000:.2f}ms, "
+        f"레코드 접근 {access_seconds * 1e6:.2f}µs"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"보고서 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
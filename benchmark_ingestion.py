@@ -0,0 +1,296 @@
+"""
+CSV → 검색 가능한 faiss_index_{lang} 수집(ingestion) 파이프라인 벤치마크
+
+합성 스택오버플로우 HTML 말뭉치(크기 설정 가능)와 결정적인 스텁 임베딩으로
+실제 인덱스 생성 경로를 단계별로 실행하고, 단계마다 벽시계 시간, 처리량,
+tracemalloc 최대 할당량, RSS 최댓값을 기록하여 JSON으로 저장한다.
+
+단계: read_csv → clean_html → build_corpus → embed_documents → faiss_build → save
+
+사용 예:
+    python benchmark_ingestion.py --sizes 1000 5000 20000 --output ingestion.json
+    python benchmark_ingestion.py --sizes 5000 --compare ingestion.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from utils.compact_corpus import CompactCorpus
+from utils.data_loader import preprocess_stackoverflow_data
+from utils.metrics import RssSampler, current_rss_bytes
+from utils.stub_backends import StubEmbeddings, make_synthetic_qa_frame
+from utils.vector_store import VectorStore
+
+STAGES = (
+    "read_csv",
+    "clean_html",
+    "build_corpus",
+    "embed_documents",
+    "faiss_build",
+    "save",
+)
+
+
+class StageProfiler:
+    """단계별 벽시계 시간, 처리량, tracemalloc 최대 할당량, RSS 최댓값 측정"""
+
+    def __init__(self, trace_memory: bool = True, rss_interval: float = 0.01):
+        """
+        Args:
+            trace_memory: tracemalloc으로 Python 할당량을 측정할지 여부
+                (측정 중에는 실행 시간이 늘어남)
+            rss_interval: RSS 샘플링 간격(초)
+        """
+        self.trace_memory = trace_memory
+        self.rss_interval = rss_interval
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str, items: int):
+        """
+        Args:
+            name: 단계 이름
+            items: 단계에서 처리하는 문서 수 (처리량 계산용)
+        """
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        rss_before = current_rss_bytes()
+        sampler = RssSampler(self.rss_interval)
+        sampler.start()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+            record = {
+                "seconds": elapsed,
+                "items": items,
+                "throughput_per_second": items / elapsed if elapsed else 0.0,
+                "rss_before_bytes": rss_before,
+                "rss_peak_bytes": sampler.peak,
+                "rss_peak_delta_bytes": sampler.peak - rss_before,
+            }
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record["traced_peak_bytes"] = peak - traced_before
+                record["traced_retained_bytes"] = current - traced_before
+            self.stages[name] = record
+
+
+def warm_up(args: argparse.Namespace):
+    """
+    측정 전에 문서 하나로 인덱스를 만들어 faiss import와 초기화를 미리 수행
+
+    FAISS.from_embeddings는 처음 실행될 때 faiss를 불러오므로, 그대로 두면 첫 실행의
+    faiss_build 단계에 import 시간과 메모리가 포함된다.
+    """
+    corpus = CompactCorpus.from_records([("warm up", "warm up", "")])
+    vector_store = VectorStore(StubEmbeddings(dimension=args.dimension))
+    vector_store.build_index(corpus, vector_store.embed_corpus(corpus))
+
+
+def run_ingestion(args: argparse.Namespace, size: int, workdir: str) -> Dict:
+    """
+    합성 CSV 하나를 인덱스로 만드는 전체 파이프라인을 한 번 실행
+
+    Returns:
+        {"documents", "total_seconds", "stages": {단계: 측정값}, ...}
+    """
+    csv_path = os.path.join(workdir, f"stackoverflow_{args.language}_qa.csv")
+    index_path = os.path.join(workdir, f"faiss_index_{args.language}")
+    make_synthetic_qa_frame(args.language, size, args.seed).to_csv(
+        csv_path, index=False
+    )
+
+    embeddings = StubEmbeddings(
+        dimension=args.dimension, per_text_latency=args.embed_latency
+    )
+    vector_store = VectorStore(embeddings)
+    profiler = StageProfiler(trace_memory=not args.no_tracemalloc)
+
+    if profiler.trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with profiler.stage("read_csv", size):
+            df = pd.read_csv(csv_path)
+        with profiler.stage("clean_html", len(df)):
+            df = preprocess_stackoverflow_data(df)
+        with profiler.stage("build_corpus", len(df)):
+            corpus = CompactCorpus.from_frame(df)
+        del df
+        with profiler.stage("embed_documents", len(corpus)):
+            vectors = vector_store.embed_corpus(corpus)
+        with profiler.stage("faiss_build", len(corpus)):
+            vector_store.build_index(corpus, vectors)
+        del vectors
+        with profiler.stage("save", len(corpus)):
+            vector_store.save_vectorstore(index_path)
+    finally:
+        total_seconds = time.perf_counter() - start
+        if profiler.trace_memory:
+            tracemalloc.stop()
+
+    return {
+        "documents": len(corpus),
+        "csv_bytes": os.path.getsize(csv_path),
+        "index_bytes": sum(
+            os.path.getsize(os.path.join(index_path, name))
+            for name in os.listdir(index_path)
+        ),
+        "total_seconds": total_seconds,
+        "throughput_per_second": len(corpus) / total_seconds,
+        "stages": profiler.stages,
+    }
+
+
+def summarize_runs(runs: List[Dict]) -> Dict:
+    """반복 실행 결과 요약 (시간은 중앙값, 메모리는 최댓값)"""
+    summary = {
+        "documents": runs[0]["documents"],
+        "csv_bytes": runs[0]["csv_bytes"],
+        "index_bytes": runs[0]["index_bytes"],
+        "total_seconds": statistics.median(run["total_seconds"] for run in runs),
+        "stages": {},
+        "runs": runs,
+    }
+    summary["throughput_per_second"] = summary["documents"] / summary["total_seconds"]
+
+    for stage in STAGES:
+        records = [run["stages"][stage] for run in runs]
+        merged = {"seconds": statistics.median(r["seconds"] for r in records)}
+        merged["throughput_per_second"] = (
+            records[0]["items"] / merged["seconds"] if merged["seconds"] else 0.0
+        )
+        merged["share"] = merged["seconds"] / summary["total_seconds"]
+        for key in records[0]:
+            if key.endswith("_bytes"):
+                merged[key] = max(r[key] for r in records)
+        summary["stages"][stage] = merged
+    return summary
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_report(report: Dict, baseline: Optional[Dict] = None) -> str:
+    """결과를 표로 변환 (baseline이 있으면 단계별 시간 비율을 함께 표시)"""
+    mb = 1024 * 1024
+    lines = []
+    baseline_sizes = {
+        result["documents"]: result for result in (baseline or {}).get("results", [])
+    }
+
+    for result in report["results"]:
+        lines.append(
+            f"문서 {result['documents']}개: 총 {result['total_seconds']:.2f}초 "
+            f"({result['throughput_per_second']:.0f} docs/s), "
+            f"인덱스 {result['index_bytes'] / mb:.1f}MB"
+        )
+        header = (
+            f"  {'단계':<18}{'시간(s)':>10}{'비중':>8}{'docs/s':>12}"
+            f"{'trace 최대(MB)':>16}{'RSS 증가(MB)':>14}"
+        )
+        previous = baseline_sizes.get(result["documents"])
+        if previous:
+            header += f"{'기준 대비':>12}"
+        lines.append(header)
+
+        for stage, values in result["stages"].items():
+            line = (
+                f"  {stage:<18}{values['seconds']:>10.3f}{values['share']:>8.0%}"
+                f"{values['throughput_per_second']:>12.0f}"
+                f"{values.get('traced_peak_bytes', 0) / mb:>16.1f}"
+                f"{values['rss_peak_delta_bytes'] / mb:>14.1f}"
+            )
+            if previous and stage in previous["stages"]:
+                ratio = values["seconds"] / previous["stages"][stage]["seconds"]
+                line += f"{ratio:>11.2f}x"
+            lines.append(line)
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="수집 파이프라인 벤치마크")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 5000], help="말뭉치 크기 목록"
+    )
+    parser.add_argument("--repeats", type=int, default=1, help="크기별 반복 횟수")
+    parser.add_argument("--language", default="java", help="합성 데이터 주제 언어")
+    parser.add_argument("--dimension", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument(
+        "--embed-latency", type=float, default=0.0, help="문서 1개당 임베딩 지연(초)"
+    )
+    parser.add_argument(
+        "--no-tracemalloc",
+        action="store_true",
+        help="tracemalloc 측정 끄기 (순수 실행 시간 측정용)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON 결과 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 JSON 결과")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    warm_up(args)
+
+    results = []
+    for size in args.sizes:
+        runs = []
+        for _ in range(args.repeats):
+            with tempfile.TemporaryDirectory() as workdir:
+                runs.append(run_ingestion(args, size, workdir))
+        results.append(summarize_runs(runs))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": vars(args),
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(format_report(report, baseline))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+워커 프로세스별 인덱스 메모리 벤치마크 (개별 FAISS 로드 vs 공유 메모리 연결)
+
+스텁 임베딩으로 합성 인덱스를 만든 뒤 N개의 워커 프로세스를 동시에 띄워
+각 모드에서의 로드/연결 시간과 워커별 RSS(전용 anon, 공유 file/shmem, PSS)를 측정한다.
+
+사용 예:
+    python benchmark_shared_index.py --workers 4 --corpus-size 5000 --dimension 1536
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from utils.languages import LANGUAGES
+from utils.metrics import rss_breakdown
+from utils.stub_backends import StubEmbeddings, make_synthetic_qa_frame
+from utils.vector_store import build_vector_stores
+
+
+def _worker(
+    mode: str,
+    workdir: str,
+    shared_dir: str,
+    dimension: int,
+    queries: List[str],
+    barrier,
+    results,
+):
+    """인덱스를 로드(또는 연결)하고 검색한 뒤 모든 워커가 살아 있는 상태에서 메모리 측정"""
+    baseline = rss_breakdown()
+    start = time.perf_counter()
+    vector_stores = build_vector_stores(
+        StubEmbeddings(dimension=dimension),
+        LANGUAGES,
+        index_dir=workdir,
+        data_dir=os.path.join(workdir, "data"),
+        shared=mode == "shared",
+        shared_dir=shared_dir,
+    )
+    load_seconds = time.perf_counter() - start
+
+    # 검색으로 벡터 페이지를 실제로 읽어 들여 RSS에 반영
+    for question in queries:
+        for vector_store in vector_stores.values():
+            vector_store.get_similar_questions(question)
+
+    barrier.wait()
+    memory = rss_breakdown()
+    results.put(
+        {
+            "load_seconds": load_seconds,
+            "memory": memory,
+            "growth_anon": memory["anon"] - baseline["anon"],
+        }
+    )
+    barrier.wait()
+
+
+def run_mode(args, mode: str, workdir: str, shared_dir: str, queries: List[str]):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.workers)
+    results = context.Queue()
+    workers = [
+        context.Process(
+            target=_worker,
+            args=(mode, workdir, shared_dir, args.dimension, queries, barrier, results),
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    reports = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    def mean(key: str) -> float:
+        return statistics.mean(report["memory"].get(key, 0) for report in reports)
+
+    return {
+        "workers": args.workers,
+        "load_seconds_median": statistics.median(r["load_seconds"] for r in reports),
+        "rss_mean_bytes": mean("rss"),
+        "anon_mean_bytes": mean("anon"),
+        "shared_mean_bytes": mean("file") + mean("shmem"),
+        "anon_growth_mean_bytes": statistics.mean(r["growth_anon"] for r in reports),
+        "pss_total_bytes": sum(r["memory"].get("pss", 0) for r in reports),
+    }
+
+
+def check_parity(workdir: str, shared_dir: str, dimension: int, queries: List[str]):
+    """같은 질문에 대해 두 모드의 검색 결과가 다른 횟수 반환"""
+    kwargs = dict(
+        index_dir=workdir, data_dir=os.path.join(workdir, "data"), shared_dir=shared_dir
+    )
+    embeddings = StubEmbeddings(dimension=dimension)
+    private = build_vector_stores(embeddings, LANGUAGES, shared=False, **kwargs)
+    shared = build_vector_stores(embeddings, LANGUAGES, shared=True, **kwargs)
+
+    mismatches = 0
+    for question in queries:
+        for lang in LANGUAGES:
+            expected = private[lang].get_similar_questions(question)
+            actual = shared[lang].get_similar_questions(question)
+            # 거리가 같은 문서는 순서가 달라질 수 있으므로 점수로 비교
+            mismatches += len(expected) != len(actual) or any(
+                abs(e["similarity_score"] - a["similarity_score"]) > 1e-3
+                for e, a in zip(expected, actual)
+            )
+    return mismatches
+
+
+def format_report(report: Dict) -> str:
+    mb = 1024 * 1024
+    lines = [
+        f"워커 {report['workers']}개, 언어별 문서 {report['corpus_size']}개, "
+        f"차원 {report['dimension']}, 결과 불일치 {report['mismatches']}건",
+        f"공유 인덱스 내보내기: {report['export_seconds']:.2f}초",
+        "",
+        f"{'모드':<10}{'로드(ms)':>10}{'RSS(MB)':>10}{'전용(MB)':>10}"
+        f"{'공유(MB)':>10}{'PSS 합계(MB)':>14}",
+    ]
+    for mode in ("private", "shared"):
+        values = report[mode]
+        lines.append(
+            f"{mode:<10}{values['load_seconds_median'] * 1000:>10.1f}"
+            f"{values['rss_mean_bytes'] / mb:>10.1f}"
+            f"{values['anon_mean_bytes'] / mb:>10.1f}"
+            f"{values['shared_mean_bytes'] / mb:>10.1f}"
+            f"{values['pss_total_bytes'] / mb:>14.1f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="공유 메모리 인덱스 벤치마크")
+    parser.add_argument("--workers", type=int, default=4, help="워커 프로세스 수")
+    parser.add_argument("--corpus-size", type=int, default=2000, help="언어별 문서 수")
+    parser.add_argument("--dimension", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--queries", type=int, default=10, help="워커별 검색 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON 보고서 저장 경로")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="qa-shared-bench-")
+    shared_dir = tempfile.mkdtemp(
+        prefix="qa-shared-bench-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    )
+    try:
+        data_dir = os.path.join(workdir, "data")
+        os.makedirs(data_dir)
+        frames = {}
+        for lang in LANGUAGES:
+            frames[lang] = make_synthetic_qa_frame(lang, args.corpus_size, args.seed)
+            frames[lang].to_csv(
+                os.path.join(data_dir, f"stackoverflow_{lang}_qa.csv"), index=False
+            )
+        queries = list(frames[LANGUAGES[0]]["question_title"][: args.queries])
+
+        print("인덱스를 생성하는 중...")
+        embeddings = StubEmbeddings(dimension=args.dimension)
+        build_vector_stores(
+            embeddings, LANGUAGES, index_dir=workdir, data_dir=data_dir, shared=False
+        )
+        start = time.perf_counter()
+        build_vector_stores(
+            embeddings,
+            LANGUAGES,
+            index_dir=workdir,
+            data_dir=data_dir,
+            shared=True,
+            shared_dir=shared_dir,
+        )
+        export_seconds = time.perf_counter() - start
+
+        report = {
+            "workers": args.workers,
+            "corpus_size": args.corpus_size,
+            "dimension": args.dimension,
+            "export_seconds": export_seconds,
+            "mismatches": check_parity(workdir, shared_dir, args.dimension, queries),
+        }
+        for mode in ("private", "shared"):
+            print(f"{mode} 모드 워커 {args.workers}개 실행 중...")
+            report[mode] = run_mode(args, mode, workdir, shared_dir, queries)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"보고서 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
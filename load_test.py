@@ -0,0 +1,313 @@
+"""
+process_question 파이프라인 오프라인 부하 테스트
+
+OpenAI 대신 결정적인 스텁 임베딩/LLM(지연 시간 설정 가능)을 사용하여
+N명의 동시 사용자가 질문 트레이스를 재생할 때의 처리량, 단계별 지연 시간,
+메모리 증가량을 측정한다.
+
+사용 예:
+    python load_test.py --users 16 --requests 400
+    python load_test.py --trace trace.jsonl --mode async --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Dict, List
+
+import pandas as pd
+
+from utils.confidence_gate import ConfidenceGate
+from utils.languages import LANGUAGES
+from utils.llm_chain import LLMChain
+from utils.metrics import RssSampler, current_rss_bytes, metrics
+from utils.qa_service import QAService
+from utils.stub_backends import (
+    StubChatModel,
+    StubEmbeddings,
+    make_question_trace,
+    make_synthetic_qa_frame,
+)
+from utils.vector_store import build_vector_stores
+
+
+def load_trace(path: str) -> List[Dict[str, str]]:
+    """JSONL 트레이스 로드 (한 줄에 {"question": ..., "language": ...})"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_trace(trace: List[Dict[str, str]], path: str):
+    """트레이스를 JSONL로 저장 (다음 실행에서 같은 순서로 재생하기 위함)"""
+    with open(path, "w", encoding="utf-8") as f:
+        for item in trace:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def build_service(
+    args: argparse.Namespace, workdir: str, frames: Dict[str, pd.DataFrame]
+) -> QAService:
+    """
+    합성 데이터와 스텁 백엔드로 QAService 구성
+
+    실제 앱과 같은 경로(CSV 로드 → 전처리 → 인덱스 생성/저장)를 거쳐 인덱스를 만든다.
+    """
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    for lang, frame in frames.items():
+        csv_path = os.path.join(data_dir, f"stackoverflow_{lang}_qa.csv")
+        frame.to_csv(csv_path, index=False)
+
+    embeddings = StubEmbeddings(latency=args.embed_latency)
+    vector_stores = build_vector_stores(
+        embeddings, list(frames), index_dir=workdir, data_dir=data_dir
+    )
+
+    llm = StubChatModel(
+        first_token_latency=args.llm_latency,
+        token_latency=args.token_latency,
+        num_tokens=args.num_tokens,
+    )
+    llm_chain = LLMChain(llm=llm, enable_tracing=False, max_concurrency=args.users)
+    return QAService(
+        vector_stores,
+        llm_chain,
+        coalesce=not args.no_coalesce,
+        # 게이트 기본 임계값은 OpenAI 임베딩 기준이므로 스텁 실행에서는 명시적으로 켬
+        gate=ConfidenceGate(
+            enabled=args.gate,
+            direct_threshold=args.gate_direct_threshold,
+            no_match_threshold=args.gate_no_match_threshold,
+        ),
+    )
+
+
+def _run_sync(service: QAService, trace: List[Dict], users: int, think_time: float):
+    """사용자마다 스레드 하나 (Streamlit 세션과 같은 모델)"""
+    cursor = iter(range(len(trace)))
+    lock = threading.Lock()
+    errors = []
+
+    def user():
+        while True:
+            with lock:
+                idx = next(cursor, None)
+            if idx is None:
+                return
+            item = trace[idx]
+            start = time.perf_counter()
+            try:
+                service.process_question(item["question"], item["language"])
+            except Exception as e:
+                errors.append(str(e))
+            metrics.observe("load_test.request", time.perf_counter() - start)
+            time.sleep(think_time)
+
+    threads = [threading.Thread(target=user) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def _run_async(service: QAService, trace: List[Dict], users: int, think_time: float):
+    """모든 사용자를 하나의 이벤트 루프에서 코루틴으로 실행"""
+    cursor = iter(range(len(trace)))
+    errors = []
+
+    async def user():
+        for idx in cursor:
+            item = trace[idx]
+            start = time.perf_counter()
+            try:
+                await service.aprocess_question(item["question"], item["language"])
+            except Exception as e:
+                errors.append(str(e))
+            metrics.observe("load_test.request", time.perf_counter() - start)
+            await asyncio.sleep(think_time)
+
+    async def main():
+        await asyncio.gather(*[user() for _ in range(users)])
+
+    asyncio.run(main())
+    return errors
+
+
+def run_load_test(
+    service: QAService,
+    trace: List[Dict[str, str]],
+    users: int,
+    think_time: float = 0.0,
+    mode: str = "sync",
+    trace_memory: bool = False,
+) -> Dict:
+    """
+    동시 사용자 N명으로 트레이스를 재생하고 결과 보고서 반환
+
+    처리량과 지연 시간은 항상 tracemalloc 없이 측정한다 (tracemalloc은 모든 할당을
+    추적하므로 처리량을 몇 배 떨어뜨림). 메모리 증가량은 RSS로 측정하고,
+    trace_memory가 켜져 있으면 같은 트레이스를 한 번 더 재생하여 Python 할당
+    최댓값만 따로 측정한다.
+
+    Args:
+        service: 테스트할 QAService
+        trace: 질문 트레이스 (사용자들이 순서대로 나누어 처리)
+        users: 동시 사용자 수
+        think_time: 사용자별 요청 사이 대기 시간(초)
+        mode: "sync"(사용자별 스레드) 또는 "async"(단일 이벤트 루프)
+        trace_memory: 추가 재생으로 tracemalloc 최대 할당량을 측정할지 여부
+    Returns:
+        처리량, 단계별 p50/p95/p99, 메모리 증가량을 포함한 딕셔너리
+    """
+    metrics.reset()
+    rss_before = current_rss_bytes()
+    sampler = RssSampler()
+    sampler.start()
+
+    start = time.perf_counter()
+    runner = _run_async if mode == "async" else _run_sync
+    errors = runner(service, trace, users, think_time)
+    elapsed = time.perf_counter() - start
+
+    sampler.stop()
+    rss_after = current_rss_bytes()
+    snapshot = metrics.snapshot()
+
+    memory = {
+        "rss_before_bytes": rss_before,
+        "rss_after_bytes": rss_after,
+        "rss_peak_bytes": sampler.peak,
+        "rss_growth_bytes": rss_after - rss_before,
+    }
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            runner(service, trace, users, think_time)
+            traced_current, traced_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        memory["traced_current_bytes"] = traced_current
+        memory["traced_peak_bytes"] = traced_peak
+
+    return {
+        "mode": mode,
+        "users": users,
+        "requests": len(trace),
+        "errors": len(errors),
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(trace) / elapsed if elapsed else 0.0,
+        "stages": snapshot["stages"],
+        "counters": snapshot["counters"],
+        "memory": memory,
+    }
+
+
+def format_report(report: Dict) -> str:
+    """보고서를 사람이 읽기 쉬운 표 형태로 변환"""
+    mb = 1024 * 1024
+    memory = report["memory"]
+    lines = [
+        f"모드: {report['mode']}  동시 사용자: {report['users']}  "
+        f"요청: {report['requests']}  오류: {report['errors']}",
+        f"소요 시간: {report['elapsed_seconds']:.2f}초  "
+        f"처리량: {report['throughput_rps']:.2f} req/s",
+        f"RSS: {memory['rss_before_bytes'] / mb:.1f}MB → "
+        f"{memory['rss_after_bytes'] / mb:.1f}MB "
+        f"(증가 {memory['rss_growth_bytes'] / mb:+.1f}MB, "
+        f"최대 {memory['rss_peak_bytes'] / mb:.1f}MB)",
+        "",
+        f"{'단계':<34}{'호출':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}",
+    ]
+    if "traced_peak_bytes" in memory:
+        lines[2] += f"  tracemalloc 최대: {memory['traced_peak_bytes'] / mb:.1f}MB"
+    for stage, values in report["stages"].items():
+        lines.append(
+            f"{stage:<34}{values['count']:>8}{values['p50'] * 1000:>10.1f}"
+            f"{values['p95'] * 1000:>10.1f}{values['p99'] * 1000:>10.1f}"
+        )
+    if report["counters"]:
+        lines.append("")
+        for name, value in report["counters"].items():
+            lines.append(f"{name}: {value:g}")
+
+    decisions = report["counters"].get("gate.decisions")
+    if decisions:
+        avoided = report["counters"].get("gate.llm_calls_avoided", 0) / decisions
+        lines.append(f"신뢰도 게이트로 생략한 LLM 호출 비율: {avoided:.1%}")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="QA 파이프라인 오프라인 부하 테스트")
+    parser.add_argument("--users", type=int, default=8, help="동시 사용자 수")
+    parser.add_argument("--requests", type=int, default=200, help="트레이스 길이")
+    parser.add_argument("--trace", help="재생할 JSONL 트레이스 (없으면 합성)")
+    parser.add_argument("--save-trace", help="사용한 트레이스를 JSONL로 저장할 경로")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--corpus-size", type=int, default=500, help="언어별 문서 수")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="임베딩 지연")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="첫 토큰 지연")
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--num-tokens", type=int, default=40)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--repeat-ratio", type=float, default=0.2)
+    parser.add_argument("--no-coalesce", action="store_true", help="동일 질문 병합 끄기")
+    parser.add_argument("--gate", action="store_true", help="신뢰도 게이트 켜기")
+    parser.add_argument("--gate-direct-threshold", type=float, default=None)
+    parser.add_argument("--gate-no-match-threshold", type=float, default=None)
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="트레이스를 한 번 더 재생하여 tracemalloc 최대 할당량 측정 "
+        "(시간 측정은 추적 없는 첫 재생 기준)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON 보고서 저장 경로")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    frames = {
+        lang: make_synthetic_qa_frame(lang, args.corpus_size, args.seed)
+        for lang in LANGUAGES
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print("스텁 백엔드로 인덱스를 구성하는 중...")
+        service = build_service(args, workdir, frames)
+
+        if args.trace:
+            trace = load_trace(args.trace)
+        else:
+            trace = make_question_trace(
+                frames, args.requests, args.seed, args.repeat_ratio
+            )
+        if args.save_trace:
+            save_trace(trace, args.save_trace)
+
+        report = run_load_test(
+            service,
+            trace,
+            args.users,
+            args.think_time,
+            args.mode,
+            trace_memory=args.tracemalloc,
+        )
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"보고서 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
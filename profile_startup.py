@@ -0,0 +1,164 @@
+"""
+앱 콜드 스타트 프로파일링 및 벤치마크
+
+1. python -X importtime 으로 `import app` 시 불러오는 모듈별 누적 import 시간 보고서
+2. 새 프로세스에서 지연 로딩(현재 app) vs 즉시 로딩(이전 방식과 같은 import 집합)의
+   시작 시간을 반복 측정하여 감소량 비교
+
+사용 예:
+    python profile_startup.py --runs 5 --top 15 --output startup_report.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+# 지연 로딩 이전 app.py가 모듈 로드 시점에 불러오던 모듈들
+EAGER_IMPORTS = [
+    "langchain_openai",
+    "utils.evaluation",
+    "utils.llm_chain",
+    "utils.qa_service",
+    "utils.service_client",
+    "utils.vector_store",
+]
+
+# 챗봇 탭에서 첫 질문을 처리할 때 필요한 모듈들 (평가 모듈은 제외)
+CHAT_IMPORTS = ["langchain_openai", "utils.llm_chain", "utils.vector_store"]
+
+SCENARIOS = {
+    "lazy": "import app",
+    "eager": "import app; " + "; ".join(f"import {m}" for m in EAGER_IMPORTS),
+    "first_chat": "import app; " + "; ".join(f"import {m}" for m in CHAT_IMPORTS),
+}
+
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_report(code: str = "import app", top: int = 15) -> Dict:
+    """
+    -X importtime 출력을 파싱하여 import 시간 보고서 생성
+
+    Returns:
+        {"total_ms", "modules": [...누적 시간 상위...], "packages": [...최상위 패키지별 합계...]}
+    """
+    stderr = _run_python(code, "-X", "importtime").stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+
+    packages: Dict[str, float] = {}
+    for module in modules:
+        root = module["module"].split(".")[0]
+        packages[root] = packages.get(root, 0.0) + module["self_ms"]
+
+    return {
+        "total_ms": sum(module["self_ms"] for module in modules),
+        "module_count": len(modules),
+        "modules": sorted(modules, key=lambda m: -m["cumulative_ms"])[:top],
+        "packages": [
+            {"package": name, "self_ms": ms}
+            for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:top]
+        ],
+    }
+
+
+def benchmark_startup(runs: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    시나리오별로 새 프로세스의 시작 시간을 반복 측정
+
+    Returns:
+        {시나리오: {"median_s", "min_s", "max_s", "runs": [...]}}
+    """
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings: List[float] = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            _run_python(code)
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            "median_s": statistics.median(timings),
+            "min_s": min(timings),
+            "max_s": max(timings),
+            "runs": timings,
+        }
+    return results
+
+
+def format_report(profile: Dict, startup: Dict) -> str:
+    lines = [
+        f"`import app` import 시간: {profile['total_ms']:.0f}ms "
+        f"(모듈 {profile['module_count']}개)",
+        "",
+        "누적 import 시간 상위 모듈:",
+    ]
+    for module in profile["modules"]:
+        lines.append(f"  {module['cumulative_ms']:>9.1f}ms  {module['module']}")
+
+    lines += ["", "패키지별 자체 import 시간:"]
+    for package in profile["packages"]:
+        lines.append(f"  {package['self_ms']:>9.1f}ms  {package['package']}")
+
+    lines += ["", "콜드 스타트 (새 프로세스, 중앙값):"]
+    for name, values in startup.items():
+        lines.append(
+            f"  {name:<12}{values['median_s'] * 1000:>9.0f}ms  "
+            f"(min {values['min_s'] * 1000:.0f}ms, max {values['max_s'] * 1000:.0f}ms)"
+        )
+
+    eager, lazy = startup["eager"]["median_s"], startup["lazy"]["median_s"]
+    lines.append(
+        f"\n지연 로딩으로 시작 시간 {(eager - lazy) * 1000:.0f}ms 감소 "
+        f"({(1 - lazy / eager) * 100:.0f}%)"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 콜드 스타트 프로파일링")
+    parser.add_argument("--runs", type=int, default=5, help="시나리오별 반복 횟수")
+    parser.add_argument("--top", type=int, default=15, help="보고서에 표시할 모듈 수")
+    parser.add_argument("--output", help="JSON 보고서 저장 경로")
+    args = parser.parse_args()
+
+    profile = import_time_report(top=args.top)
+    startup = benchmark_startup(args.runs)
+    print(format_report(profile, startup))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"import_profile": profile, "startup": startup},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"보고서 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
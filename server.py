@@ -0,0 +1,370 @@
+"""
+Streamlit과 분리된 헤드리스 QA HTTP 서비스 (aiohttp)
+
+엔드포인트:
+    GET  /healthz               상태 확인
+    GET  /metrics               Prometheus 텍스트 지표 (?format=json 이면 JSON)
+    POST /v1/search             {"question", "language"} → 유사 질문 검색 결과
+                                (language가 "auto"이면 모든 언어 인덱스를 검색)
+    POST /v1/answer             {"question", "language"} → 검색 결과 + AI 답변
+    POST /v1/answer/stream      {"question", "language"} → NDJSON 스트림
+    POST /v1/batch              {"items": [{"question", "language"[, "mode"]}]}
+                                (질문마다 동시 처리 한도와 대기열을 적용)
+
+워커마다 인덱스와 클라이언트를 한 번만 로드하고, 동시 처리 수와 대기열 길이를
+제한하여 과부하 시 503으로 즉시 거절한다.
+
+실행 예:
+    python server.py --port 8000 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from utils.languages import AUTO_LANGUAGE, LANGUAGES
+from utils.metrics import metrics
+from utils.qa_service import QAService
+
+
+class Overloaded(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음"""
+
+
+class AdmissionController:
+    """
+    동시 처리 수와 대기열 길이를 제한하는 백프레셔 장치
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        """
+        Args:
+            max_in_flight: 동시에 처리할 최대 요청 수
+            max_queue: 처리 대기 중인 요청의 최대 수 (초과 시 즉시 거절)
+            queue_timeout: 대기열에서 기다릴 최대 시간(초)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @asynccontextmanager
+    async def admit(self):
+        # 처리 중 + 대기 중인 요청이 한도를 넘으면 대기열에 넣지 않고 즉시 거절
+        if self.in_flight + self.waiting >= self.max_in_flight + self.max_queue:
+            raise Overloaded()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise Overloaded()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+SERVICE_KEY = web.AppKey("service", QAService)
+ADMISSION_KEY = web.AppKey("admission", AdmissionController)
+MAX_BATCH_SIZE_KEY = web.AppKey("max_batch_size", int)
+
+OVERLOADED_MESSAGE = "서버가 과부하 상태입니다. 잠시 후 다시 시도하세요."
+
+# 핸들러가 작업 단위(배치 항목)마다 직접 백프레셔를 적용하는 경로
+SELF_ADMITTED_PATHS = {"/v1/batch"}
+
+
+def _overloaded_response() -> web.Response:
+    return web.json_response(
+        {"error": OVERLOADED_MESSAGE}, status=503, headers={"Retry-After": "1"}
+    )
+
+
+@web.middleware
+async def admission_middleware(request: web.Request, handler):
+    """/v1 요청에만 백프레셔 적용"""
+    if not request.path.startswith("/v1/"):
+        return await handler(request)
+
+    span_name = f"server{request.path.replace('/', '.')}"
+    if request.path in SELF_ADMITTED_PATHS:
+        with metrics.span(span_name):
+            return await handler(request)
+
+    try:
+        async with request.app[ADMISSION_KEY].admit():
+            with metrics.span(span_name):
+                return await handler(request)
+    except Overloaded:
+        metrics.increment("server.rejected")
+        return _overloaded_response()
+
+
+async def _read_question(request: web.Request) -> Dict:
+    try:
+        payload = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="JSON 본문이 필요합니다.")
+    _validate_question(payload)
+    return payload
+
+
+def _validate_question(payload: Dict):
+    if not isinstance(payload, dict):
+        raise web.HTTPBadRequest(text="JSON 객체가 필요합니다.")
+    question = payload.get("question")
+    if not isinstance(question, str) or not question.strip():
+        raise web.HTTPBadRequest(text="question 필드(문자열)가 필요합니다.")
+    if not isinstance(payload.get("language"), str):
+        raise web.HTTPBadRequest(text="language 필드(문자열)가 필요합니다.")
+
+
+def _check_language(service: QAService, language: str):
+    if language != AUTO_LANGUAGE and language not in service.languages:
+        raise web.HTTPBadRequest(text=f"지원하지 않는 언어입니다: {language}")
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    admission = request.app[ADMISSION_KEY]
+    return web.json_response(
+        {
+            "status": "ok",
+            "languages": request.app[SERVICE_KEY].languages,
+            "in_flight": admission.in_flight,
+            "waiting": admission.waiting,
+        }
+    )
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    if request.query.get("format") == "json":
+        return web.json_response(metrics.snapshot())
+    return web.Response(text=metrics.export_prometheus(), content_type="text/plain")
+
+
+async def handle_search(request: web.Request) -> web.Response:
+    payload = await _read_question(request)
+    service = request.app[SERVICE_KEY]
+    _check_language(service, payload["language"])
+
+    results = await service.aretrieve(payload["question"], payload["language"])
+    return web.json_response({"results": results})
+
+
+async def handle_answer(request: web.Request) -> web.Response:
+    payload = await _read_question(request)
+    service = request.app[SERVICE_KEY]
+    _check_language(service, payload["language"])
+
+    results, answer = await service.aprocess_question(
+        payload["question"], payload["language"]
+    )
+    return web.json_response({"results": results, "answer": answer})
+
+
+async def handle_answer_stream(request: web.Request) -> web.StreamResponse:
+    """
+    NDJSON 스트림: {"type": "results"} → {"type": "token"}... → {"type": "done"}
+
+    컨텍스트는 항상 서버에서 검색한다. 클라이언트가 보낸 결과의 본문과 점수를
+    그대로 쓰면 게이트가 임의의 텍스트를 채택 답변으로 반환할 수 있으므로,
+    이전 클라이언트가 보내는 results 필드는 무시한다.
+    """
+    payload = await _read_question(request)
+    service = request.app[SERVICE_KEY]
+    question, language = payload["question"], payload["language"]
+    _check_language(service, language)
+
+    results = await service.aretrieve(question, language)
+
+    response = web.StreamResponse(
+        headers={"Content-Type": "application/x-ndjson; charset=utf-8"}
+    )
+    await response.prepare(request)
+
+    async def send(event: Dict):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        await response.write(line.encode("utf-8"))
+
+    await send({"type": "results", "results": results})
+    stats = {}
+    async for token in service.astream_answer(question, language, results, stats):
+        await send({"type": "token", "text": token})
+    await send({"type": "done", "stats": stats})
+
+    await response.write_eof()
+    return response
+
+
+async def handle_batch(request: web.Request) -> web.Response:
+    """
+    여러 질문을 한 번에 처리 (mode: "search" 또는 "answer", 기본값 answer)
+
+    배치 요청 자체는 처리 슬롯을 차지하지 않고, 각 항목이 일반 요청과 같은
+    AdmissionController를 거친다. 한도를 넘은 항목은 과부하 오류로 채워지고,
+    모든 항목이 거절되면 503을 반환한다.
+    """
+    try:
+        payload = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="JSON 본문이 필요합니다.")
+
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise web.HTTPBadRequest(text="items 배열이 필요합니다.")
+    max_batch_size = request.app[MAX_BATCH_SIZE_KEY]
+    if len(items) > max_batch_size:
+        raise web.HTTPRequestEntityTooLarge(
+            max_size=max_batch_size, actual_size=len(items)
+        )
+
+    service = request.app[SERVICE_KEY]
+    admission = request.app[ADMISSION_KEY]
+    for item in items:
+        _validate_question(item)
+        _check_language(service, item["language"])
+
+    async def run(item: Dict) -> Dict:
+        async with admission.admit():
+            if item.get("mode") == "search":
+                results = await service.aretrieve(item["question"], item["language"])
+                return {"results": results}
+            results, answer = await service.aprocess_question(
+                item["question"], item["language"]
+            )
+            return {"results": results, "answer": answer}
+
+    outputs = await asyncio.gather(
+        *[run(item) for item in items], return_exceptions=True
+    )
+    rejected = sum(isinstance(output, Overloaded) for output in outputs)
+    if rejected:
+        metrics.increment("server.rejected", rejected)
+    if rejected == len(outputs):
+        return _overloaded_response()
+    return web.json_response(
+        {
+            "items": [
+                {"error": _item_error(output)} if isinstance(output, Exception)
+                else output
+                for output in outputs
+            ]
+        }
+    )
+
+
+def _item_error(error: Exception) -> str:
+    return OVERLOADED_MESSAGE if isinstance(error, Overloaded) else str(error)
+
+
+def build_default_service() -> QAService:
+    """OpenAI 임베딩/LLM과 로컬 인덱스로 QAService 구성 (워커마다 한 번)"""
+    from langchain_openai import OpenAIEmbeddings
+
+    from utils.llm_chain import LLMChain
+    from utils.vector_store import build_vector_stores
+
+    vector_stores = build_vector_stores(OpenAIEmbeddings(), LANGUAGES)
+    return QAService(vector_stores, LLMChain())
+
+
+def create_app(
+    service: Optional[QAService] = None,
+    max_in_flight: int = 32,
+    max_queue: int = 128,
+    queue_timeout: float = 10.0,
+    max_batch_size: int = 64,
+) -> web.Application:
+    """
+    aiohttp 애플리케이션 생성
+
+    Args:
+        service: 사용할 QAService (None이면 시작 시 기본 구성으로 로드)
+        max_in_flight: 동시에 처리할 최대 요청 수
+        max_queue: 대기열 최대 길이
+        queue_timeout: 대기열 최대 대기 시간(초)
+        max_batch_size: 배치 요청 1건에 포함할 수 있는 최대 질문 수
+    """
+    app = web.Application(middlewares=[admission_middleware])
+    app[MAX_BATCH_SIZE_KEY] = max_batch_size
+
+    async def on_startup(app: web.Application):
+        app[ADMISSION_KEY] = AdmissionController(
+            max_in_flight, max_queue, queue_timeout
+        )
+        if service is not None:
+            app[SERVICE_KEY] = service
+        else:
+            # 인덱스 로드는 블로킹 작업이므로 스레드에서 실행
+            app[SERVICE_KEY] = await asyncio.to_thread(build_default_service)
+
+    app.on_startup.append(on_startup)
+    app.add_routes(
+        [
+            web.get("/healthz", handle_health),
+            web.get("/metrics", handle_metrics),
+            web.post("/v1/search", handle_search),
+            web.post("/v1/answer", handle_answer),
+            web.post("/v1/answer/stream", handle_answer_stream),
+            web.post("/v1/batch", handle_batch),
+        ]
+    )
+    return app
+
+
+def run_worker(args: argparse.Namespace):
+    load_dotenv()
+    app = create_app(
+        max_in_flight=args.max_in_flight,
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+        max_batch_size=args.max_batch_size,
+    )
+    # 여러 워커가 같은 포트를 공유 (SO_REUSEPORT)
+    web.run_app(app, host=args.host, port=args.port, reuse_port=args.workers > 1)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="QA HTTP 서비스")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="워커 프로세스 수")
+    parser.add_argument("--max-in-flight", type=int, default=32)
+    parser.add_argument("--max-queue", type=int, default=128)
+    parser.add_argument("--queue-timeout", type=float, default=10.0)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.workers == 1:
+        run_worker(args)
+        return
+
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(args,))
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
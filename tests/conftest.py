@@ -0,0 +1,65 @@
+from typing import Callable, Optional
+
+import pytest
+
+from utils.confidence_gate import ConfidenceGate
+from utils.llm_chain import LLMChain
+from utils.qa_service import QAService
+from utils.stub_backends import StubChatModel, StubEmbeddings, make_synthetic_qa_frame
+from utils.vector_store import VectorStore
+
+# 스텁 LLM의 첫 토큰 지연 (동시 처리 한도 검증에 사용)
+GENERATION_SECONDS = 0.1
+
+
+@pytest.fixture(scope="session")
+def build_stub_store() -> Callable[..., VectorStore]:
+    """합성 데이터와 스텁 임베딩으로 VectorStore를 만드는 함수"""
+
+    def build(
+        language: str,
+        size: int,
+        seed: int = 0,
+        embeddings: Optional[StubEmbeddings] = None,
+        path: Optional[str] = None,
+    ) -> VectorStore:
+        """
+        Args:
+            language: 합성 데이터 주제 언어
+            size: 문서 수
+            seed: 합성 데이터 시드
+            embeddings: 사용할 임베딩 (생략 시 64차원 스텁 임베딩)
+            path: 지정하면 인덱스를 이 경로에 저장
+        """
+        store = VectorStore(embeddings or StubEmbeddings(dimension=64))
+        frame = make_synthetic_qa_frame(language, size, seed).rename(
+            columns={"accepted_answer_body": "clean_answer"}
+        )
+        store.create_vectorstore(frame)
+        if path is not None:
+            store.save_vectorstore(path)
+        return store
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def generation_seconds() -> float:
+    """answer_service의 스텁 LLM 첫 토큰 지연(초)"""
+    return GENERATION_SECONDS
+
+
+@pytest.fixture(scope="session")
+def answer_service(build_stub_store) -> QAService:
+    """java 인덱스 하나와 지연 시간이 있는 스텁 LLM으로 구성한 QAService"""
+    llm = StubChatModel(
+        first_token_latency=GENERATION_SECONDS, token_latency=0.0, num_tokens=3
+    )
+    # 모든 질문이 LLM 답변 생성 경로로 가도록 임계값을 넓게 설정
+    gate = ConfidenceGate(enabled=True, direct_threshold=-1.0, no_match_threshold=10.0)
+    return QAService(
+        {"java": build_stub_store("java", 40)},
+        LLMChain(llm=llm, enable_tracing=False),
+        coalesce=False,
+        gate=gate,
+    )
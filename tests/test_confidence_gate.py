@@ -0,0 +1,75 @@
+import pytest
+
+from utils.confidence_gate import DIRECT, GENERATE, NO_MATCH, ConfidenceGate
+from utils.language_router import winning_language
+from utils.languages import AUTO_LANGUAGE
+from utils.qa_service import QAService
+from utils.stub_backends import (
+    StubEmbeddings,
+    make_question_trace,
+    make_synthetic_qa_frame,
+)
+
+LANGUAGES = ("java", "javascript", "c#")
+
+
+def make_gate(**kwargs) -> ConfidenceGate:
+    options = {"enabled": True, "direct_threshold": 0.1, "no_match_threshold": 0.8}
+    options.update(kwargs)
+    return ConfidenceGate(**options)
+
+
+def test_decide_keeps_calibrated_order():
+    # 라우터가 보정 점수로 고른 최상위 결과가 원시 거리가 더 커도 유지되어야 함
+    results = [
+        {"similarity_score": 0.5, "calibrated_score": 0.4, "language": "java"},
+        {"similarity_score": 0.3, "calibrated_score": 0.6, "language": "c#"},
+        {"similarity_score": 0.7, "calibrated_score": 0.9, "language": "java"},
+    ]
+    decision = make_gate().decide(results)
+    assert decision.action == GENERATE
+    assert decision.results[0]["language"] == "java"
+    assert [r["similarity_score"] for r in decision.results] == [0.5, 0.3]
+
+
+def test_decide_applies_thresholds_to_top_hit():
+    gate = make_gate()
+    assert gate.decide([]).action == NO_MATCH
+    assert gate.decide([{"similarity_score": 0.9}]).action == NO_MATCH
+    direct = gate.decide(
+        [
+            {"similarity_score": 0.05, "question": "q", "answer": "a", "link": "l"},
+            {"similarity_score": 0.01, "question": "x", "answer": "y", "link": "z"},
+        ]
+    )
+    assert direct.action == DIRECT
+    assert direct.results[0]["question"] == "q"
+
+
+def test_decide_is_idempotent():
+    gate = make_gate()
+    results = [{"similarity_score": score} for score in (0.2, 0.6, 0.7, 0.3)]
+    first = gate.decide(results)
+    assert gate.decide(first.results).results == first.results
+
+
+@pytest.fixture(scope="module")
+def service(build_stub_store):
+    embeddings = StubEmbeddings(dimension=128)
+    stores = {
+        lang: build_stub_store(lang, 80, embeddings=embeddings) for lang in LANGUAGES
+    }
+    # 모든 질문이 답변 생성 경로로 가도록 임계값을 넓게 설정
+    gate = make_gate(direct_threshold=0.0, no_match_threshold=10.0)
+    return QAService(stores, coalesce=False, gate=gate), stores
+
+
+def test_route_and_auto_retrieve_pick_same_language(service):
+    qa_service, stores = service
+    frames = {lang: make_synthetic_qa_frame(lang, 80) for lang in LANGUAGES}
+    for item in make_question_trace(frames, 150, seed=1, repeat_ratio=0.0):
+        question = item["question"]
+        routed_language, _ = qa_service.route(question)
+        results = qa_service.retrieve(question, AUTO_LANGUAGE)
+        assert winning_language(results, "") == routed_language
+        assert qa_service.prompt_language(AUTO_LANGUAGE, results) == routed_language
@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+from utils import evaluation
+from utils.evaluation import QAEvaluator, parse_evaluation_questions
+
+
+def test_csv_with_bom_and_short_rows():
+    content = "﻿question,language\nq1,java\nq2\n,c#\n"
+    assert parse_evaluation_questions(content, ".csv") == [
+        {"question": "q1", "language": "java"},
+        {"question": "q2", "language": None},
+    ]
+
+
+def test_jsonl_with_null_values():
+    content = '{"question": "a", "language": null}\n\n{"question": null}\n'
+    assert parse_evaluation_questions(content, "jsonl") == [
+        {"question": "a", "language": None}
+    ]
+
+
+@pytest.mark.parametrize(
+    "content, file_format",
+    [
+        ("title,language\nq1,java\n", "csv"),
+        ("[1, 2]\n", "jsonl"),
+        ("{not json\n", "jsonl"),
+        ("q1\n", "xlsx"),
+    ],
+)
+def test_invalid_files_raise_value_error(content, file_format):
+    with pytest.raises(ValueError):
+        parse_evaluation_questions(content, file_format)
+
+
+class FakeResult:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def to_pandas(self):
+        return self.frame
+
+
+@pytest.fixture
+def fake_evaluate(monkeypatch):
+    """RAGAS evaluate 대신 호출된 질문을 기록하고 고정 점수를 반환"""
+    calls = []
+    nan_questions = set()
+
+    def evaluate(dataset, metrics, **kwargs):
+        questions = list(dataset["question"])
+        calls.append(questions)
+        frame = pd.DataFrame(
+            [
+                {
+                    metric.name: (
+                        float("nan")
+                        if question in nan_questions and metric.name == "faithfulness"
+                        else 0.5
+                    )
+                    for metric in metrics
+                }
+                for question in questions
+            ]
+        )
+        return FakeResult(frame)
+
+    monkeypatch.setattr(evaluation, "evaluate", evaluate)
+    return calls, nan_questions
+
+
+def test_score_samples_uses_cache_and_deduplicates(fake_evaluate):
+    calls, _ = fake_evaluate
+    evaluator = QAEvaluator(cache_path=None)
+    questions = ["q1", "q2", "q1"]
+    answers = ["a1", "a2", "a1"]
+    contexts = [["c1"], ["c2"], ["c1"]]
+
+    first = evaluator.score_samples(questions, answers, contexts)
+    # 중복 샘플은 한 번만 평가
+    assert calls == [["q1", "q2"]]
+    assert first[0] == first[2] and first[0]["faithfulness"] == 0.5
+
+    second = evaluator.score_samples(questions, answers, contexts)
+    assert calls == [["q1", "q2"]]
+    assert second == first
+
+    # 답변이 바뀌면 다른 캐시 키로 다시 평가
+    evaluator.score_samples(["q1"], ["changed"], [["c1"]])
+    assert calls[-1] == ["q1"]
+
+
+def test_score_samples_retries_nan_metrics(fake_evaluate):
+    calls, nan_questions = fake_evaluate
+    evaluator = QAEvaluator(cache_path=None)
+    nan_questions.add("q1")
+
+    first = evaluator.score_samples(["q1", "q2"], ["a1", "a2"], [["c1"], ["c2"]])
+    assert "faithfulness" not in first[0]
+    assert first[0]["answer_relevancy"] == 0.5
+
+    nan_questions.clear()
+    second = evaluator.score_samples(["q1", "q2"], ["a1", "a2"], [["c1"], ["c2"]])
+    assert calls == [["q1", "q2"], ["q1"]]
+    assert second[0]["faithfulness"] == 0.5
@@ -0,0 +1,43 @@
+import asyncio
+
+from utils.llm_chain import LLMChain
+from utils.metrics import metrics
+from utils.stub_backends import StubChatModel
+
+
+class FailingChatModel(StubChatModel):
+    async def _agenerate(self, *args, **kwargs):
+        raise RuntimeError("unavailable")
+
+
+def test_retries_count_only_attempts_followed_by_a_retry(monkeypatch):
+    async def no_sleep(_):
+        return None
+
+    llm_chain = LLMChain(llm=FailingChatModel(), max_retries=2, enable_tracing=False)
+    retries = metrics.counter("generation.retries")
+    failures = metrics.counter("generation.failures")
+
+    monkeypatch.setattr("utils.llm_chain.asyncio.sleep", no_sleep)
+    answer = asyncio.run(llm_chain.agenerate_response("question", [], "java"))
+
+    assert "오류" in answer
+    assert metrics.counter("generation.retries") - retries == 2
+    assert metrics.counter("generation.failures") - failures == 1
+
+
+def test_stream_stats_respect_sample_rate(monkeypatch):
+    llm_chain = LLMChain(llm=StubChatModel(num_tokens=3), enable_tracing=False)
+    stages = ("generation.time_to_first_token", "generation.stream_total")
+
+    monkeypatch.setattr(metrics, "sample_rate", 0.0)
+    metrics.reset()
+    stats = {}
+    assert "".join(llm_chain.stream_response("question", [], "java", stats))
+    # 샘플링되지 않은 요청도 호출자에게는 생성 시간을 알려줌
+    assert "total_time" in stats
+    assert not set(stages) & set(metrics.snapshot()["stages"])
+
+    monkeypatch.setattr(metrics, "sample_rate", 1.0)
+    "".join(llm_chain.stream_response("question", [], "java"))
+    assert set(stages) <= set(metrics.snapshot()["stages"])
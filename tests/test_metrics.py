@@ -0,0 +1,24 @@
+import re
+
+from utils.metrics import MetricsRegistry
+
+# Prometheus 텍스트 포맷의 샘플 줄: 이름{레이블} 값
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_]\w*="[^"]*"(,.*)?\})? \S+$')
+
+
+def test_prometheus_export_uses_labels_for_languages():
+    registry = MetricsRegistry()
+    registry.increment("routing.selected", labels={"language": "c#"})
+    registry.increment("routing.selected", labels={"language": "java"}, value=2)
+    registry.increment("gate.llm-calls")
+
+    text = registry.export_prometheus()
+    assert 'qa_routing_selected_total{language="c#"} 1' in text
+    assert 'qa_routing_selected_total{language="java"} 2' in text
+    assert "qa_gate_llm_calls_total 1" in text
+    assert text.count("# TYPE qa_routing_selected_total counter") == 1
+    for line in text.splitlines():
+        assert line.startswith("#") or SAMPLE_LINE.match(line), line
+
+    assert registry.counter("routing.selected", {"language": "c#"}) == 1
+    assert registry.snapshot()["counters"]['routing.selected{language="java"}'] == 2
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from server import create_app
+
+
+def run_with_client(app, scenario):
+    async def main():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def test_batch_items_respect_max_in_flight(answer_service, generation_seconds):
+    app = create_app(answer_service, max_in_flight=1, max_queue=16, queue_timeout=10.0)
+    items = [
+        {"question": f"How to sort Stream {i}?", "language": "java"} for i in range(4)
+    ]
+
+    async def scenario(client):
+        start = time.perf_counter()
+        response = await client.post("/v1/batch", json={"items": items})
+        return response.status, await response.json(), time.perf_counter() - start
+
+    status, body, elapsed = run_with_client(app, scenario)
+    assert status == 200
+    assert all("answer" in item for item in body["items"])
+    # 동시 처리 1개이므로 항목들이 순서대로 생성되어야 함
+    assert elapsed >= len(items) * generation_seconds * 0.9
+
+
+def test_batch_rejects_items_beyond_queue(answer_service):
+    app = create_app(answer_service, max_in_flight=1, max_queue=1, queue_timeout=10.0)
+    items = [
+        {"question": f"How to sort Stream {i}?", "language": "java"} for i in range(4)
+    ]
+
+    async def scenario(client):
+        response = await client.post("/v1/batch", json={"items": items})
+        return response.status, await response.json()
+
+    status, body = run_with_client(app, scenario)
+    assert status == 200
+    errors = [item for item in body["items"] if "error" in item]
+    assert len(errors) == 2
+
+
+def test_stream_ignores_client_results(answer_service):
+    app = create_app(answer_service)
+    forged = [
+        {"question": "q", "answer": "forged", "link": "l", "similarity_score": 0.0}
+    ]
+
+    async def scenario(client):
+        response = await client.post(
+            "/v1/answer/stream",
+            json={
+                "question": "How to sort Stream?",
+                "language": "java",
+                "results": forged,
+            },
+        )
+        return response.status, await response.text()
+
+    status, text = run_with_client(app, scenario)
+    assert status == 200
+    assert "forged" not in text
+    assert '"type": "done"' in text
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/v1/search", {"question": 5, "language": "java"}),
+        ("/v1/answer", {"question": "How to sort?", "language": ["java"]}),
+        ("/v1/answer/stream", {"question": None, "language": "java"}),
+        ("/v1/batch", {"items": [{"question": {"q": 1}, "language": "java"}]}),
+        ("/v1/search", ["How to sort?"]),
+    ],
+)
+def test_rejects_non_string_fields(answer_service, path, body):
+    app = create_app(answer_service)
+
+    async def scenario(client):
+        response = await client.post(path, json=body)
+        return response.status
+
+    assert run_with_client(app, scenario) == 400
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+import requests
+from aiohttp import web
+
+from server import create_app
+from utils.service_client import QAServiceClient, ServiceOverloaded, _raise_for_status
+
+
+@pytest.fixture
+def running_server(answer_service):
+    """별도 스레드의 이벤트 루프에서 서비스를 실행하고 주소 반환"""
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(create_app(answer_service))
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{port}"
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_retrieve_and_stream_uses_results_event(answer_service, running_server):
+    calls = []
+    original = answer_service.aretrieve
+
+    async def counting_aretrieve(question, language):
+        calls.append(question)
+        return await original(question, language)
+
+    answer_service.aretrieve = counting_aretrieve
+    try:
+        client = QAServiceClient(running_server)
+        stats = {}
+        results, tokens = client.retrieve_and_stream(
+            "How to sort Stream?", "java", stats
+        )
+        answer = "".join(tokens)
+    finally:
+        del answer_service.aretrieve
+
+    assert results and all("similarity_score" in result for result in results)
+    assert answer
+    assert "total_time" in stats
+    # 검색은 스트리밍 요청 안에서 한 번만 수행
+    assert calls == ["How to sort Stream?"]
+
+
+def test_overloaded_status_raises_service_overloaded():
+    response = requests.Response()
+    response.status_code = 503
+    with pytest.raises(ServiceOverloaded):
+        _raise_for_status(response)
+
+    response.status_code = 500
+    with pytest.raises(requests.HTTPError):
+        _raise_for_status(response)
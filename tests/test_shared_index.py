@@ -0,0 +1,31 @@
+import os
+
+from utils.shared_index import attach_shared_store, is_export_current
+from utils.stub_backends import StubEmbeddings
+
+
+def test_exports_are_keyed_by_source_index(tmp_path, build_stub_store):
+    embeddings = StubEmbeddings(dimension=32)
+    shared_dir = str(tmp_path / "shared")
+    sources = [str(tmp_path / name / "faiss_index_java") for name in ("a", "b")]
+    stores = [
+        build_stub_store("java", 20, seed, embeddings=embeddings, path=path)
+        for seed, path in enumerate(sources)
+    ]
+
+    attached = [
+        attach_shared_store(
+            embeddings, "java", path, shared_dir, load_index=lambda s=store: s
+        )
+        for path, store in zip(sources, stores)
+    ]
+
+    # 같은 언어라도 원본 인덱스마다 별도로 내보내고 서로의 말뭉치를 덮어쓰지 않음
+    assert attached[0].path != attached[1].path
+    for shared, store in zip(attached, stores):
+        assert shared.corpus.text(0, "question_title") == store.corpus.text(
+            0, "question_title"
+        )
+    assert is_export_current(attached[0].path, sources[0])
+    assert not is_export_current(attached[0].path, sources[1])
+    assert len(os.listdir(shared_dir)) == 4  # 내보내기 2개 + 잠금 파일 2개
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight, normalize_question, question_key
+
+
+def test_question_key_normalizes_question():
+    assert question_key("java", "  How to  sort a List?? ") == (
+        "java",
+        normalize_question("how to sort a list"),
+    )
+
+
+def test_do_shares_result_between_concurrent_callers():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def compute():
+        executions.append(1)
+        started.set()
+        release.wait(5)
+        return "answer"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+    leader.start()
+    assert started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+        for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    # 대기자가 모두 등록될 때까지 기다린 뒤 계산 완료
+    deadline = time.monotonic() + 5
+    while flight.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ["answer"] * 4
+    assert len(executions) == 1
+    assert flight.stats() == {"calls": 4, "executions": 1, "coalesced": 3}
+
+
+def test_do_propagates_error_and_forgets_key():
+    flight = SingleFlight("test")
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("k", fail)
+    # 실패한 계산은 남지 않으므로 다음 호출은 다시 실행
+    assert flight.do("k", lambda: 1) == 1
+
+
+def test_ado_coalesces_concurrent_coroutines():
+    flight = SingleFlight("test")
+    executions = []
+
+    async def compute():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(*[flight.ado("k", compute) for _ in range(5)])
+
+    assert asyncio.run(main()) == ["answer"] * 5
+    assert len(executions) == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_ado_propagates_error_to_all_waiters():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            *[flight.ado("k", fail) for _ in range(3)], return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_ado_leader_cancellation_does_not_fail_followers():
+    flight = SingleFlight("test")
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        leader = asyncio.create_task(flight.ado("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "answer"
+
+
+def test_ado_cancels_computation_when_all_waiters_cancel():
+    flight = SingleFlight("test")
+    cancelled = []
+
+    async def compute():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        waiters = [asyncio.create_task(flight.ado("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        # 취소된 계산 대신 새 계산이 시작되어야 함
+        return await flight.ado("k", lambda: asyncio.sleep(0, result="fresh"))
+
+    assert asyncio.run(main()) == "fresh"
+    assert cancelled == [1]
+
+
+def test_stream_replays_chunks_to_late_subscriber():
+    flight = SingleFlight("test")
+    first_chunk = threading.Event()
+    release = threading.Event()
+
+    def produce():
+        yield "a"
+        first_chunk.set()
+        release.wait(5)
+        yield "b"
+        yield "c"
+
+    leader = flight.stream("k", produce)
+    assert next(leader) == "a"
+    assert first_chunk.wait(5)
+    follower = flight.stream("k", produce)
+    release.set()
+
+    assert list(leader) == ["b", "c"]
+    assert list(follower) == ["a", "b", "c"]
+    assert flight.stats()["executions"] == 1
+
+
+def test_stream_propagates_error_after_chunks():
+    flight = SingleFlight("test")
+
+    def produce():
+        yield "a"
+        raise RuntimeError("stream failed")
+
+    chunks = []
+    with pytest.raises(RuntimeError):
+        for chunk in flight.stream("k", produce):
+            chunks.append(chunk)
+    assert chunks == ["a"]
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+from utils.stub_backends import StubEmbeddings
+from utils.vector_store import VectorStore
+
+
+def test_load_requires_corpus_files(tmp_path, build_stub_store):
+    embeddings = StubEmbeddings(dimension=16)
+    path = str(tmp_path / "faiss_index_java")
+    build_stub_store("java", 5, embeddings=embeddings, path=path)
+
+    loaded = VectorStore(embeddings)
+    loaded.load_vectorstore(path)
+    assert loaded.get_similar_questions("Stream", k=1)
+
+    os.remove(os.path.join(path, "corpus.bin"))
+    os.remove(os.path.join(path, "corpus_offsets.npy"))
+    with pytest.raises(FileNotFoundError):
+        VectorStore(embeddings).load_vectorstore(path)
@@ -0,0 +1,188 @@
+import mmap
+import os
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+# 문서별로 저장하는 필드 (순서가 오프셋 배열의 열 순서)
+FIELDS = ("question_title", "clean_answer", "question_link")
+_FIELD_INDEX = {name: idx for idx, name in enumerate(FIELDS)}
+
+BUFFER_FILE = "corpus.bin"
+OFFSETS_FILE = "corpus_offsets.npy"
+
+
+class CorpusRecord:
+    """
+    말뭉치 문서 하나에 대한 가벼운 뷰 (문자열은 접근할 때만 디코딩)
+    """
+
+    __slots__ = ("corpus", "doc_id")
+
+    def __init__(self, corpus: "CompactCorpus", doc_id: int):
+        self.corpus = corpus
+        self.doc_id = doc_id
+
+    def view(self, field: str) -> memoryview:
+        """필드의 UTF-8 바이트를 복사 없이 반환"""
+        return self.corpus.view(self.doc_id, field)
+
+    @property
+    def question(self) -> str:
+        return self.corpus.text(self.doc_id, "question_title")
+
+    @property
+    def answer(self) -> str:
+        return self.corpus.text(self.doc_id, "clean_answer")
+
+    @property
+    def link(self) -> str:
+        return self.corpus.text(self.doc_id, "question_link")
+
+    def __repr__(self) -> str:
+        return f"CorpusRecord(doc_id={self.doc_id}, question={self.question!r})"
+
+
+class CorpusBuilder:
+    """문서를 하나씩 추가하여 CompactCorpus를 만드는 빌더"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offsets = [0]
+
+    def __len__(self) -> int:
+        return (len(self._offsets) - 1) // len(FIELDS)
+
+    def add(self, question_title: str, clean_answer: str, question_link: str) -> int:
+        """
+        문서 추가
+
+        Returns:
+            추가된 문서의 정수 ID
+        """
+        for value in (question_title, clean_answer, question_link):
+            self._buffer += str(value).encode("utf-8")
+            self._offsets.append(len(self._buffer))
+        return len(self) - 1
+
+    def build(self) -> "CompactCorpus":
+        return CompactCorpus(bytes(self._buffer), np.asarray(self._offsets, np.int64))
+
+
+class CompactCorpus:
+    """
+    QA 말뭉치의 압축 표현
+
+    모든 문자열을 하나의 연속된 UTF-8 버퍼에 저장하고, 문서 i의 필드 j는
+    offsets[i * 3 + j] ~ offsets[i * 3 + j + 1] 구간을 가리킨다. 문서는 0부터 시작하는
+    정수 ID로 식별하며, 레코드 접근은 O(1)이고 버퍼 슬라이스는 복사 없이 반환된다.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], offsets: np.ndarray):
+        """
+        Args:
+            buffer: 모든 필드를 이어 붙인 UTF-8 버퍼
+            offsets: (문서 수 * 3 + 1,) int64 오프셋 배열
+        """
+        if (len(offsets) - 1) % len(FIELDS):
+            raise ValueError("오프셋 배열의 길이가 필드 수와 맞지 않습니다.")
+        self.buffer = buffer
+        self.offsets = offsets
+        self._view = memoryview(buffer)
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Tuple[str, str, str]]
+    ) -> "CompactCorpus":
+        """(질문 제목, 정제된 답변, 링크) 튜플들로 말뭉치 생성"""
+        builder = CorpusBuilder()
+        for question_title, clean_answer, question_link in records:
+            builder.add(question_title, clean_answer, question_link)
+        return builder.build()
+
+    @classmethod
+    def from_frame(cls, df) -> "CompactCorpus":
+        """question_title, clean_answer, question_link 컬럼의 DataFrame으로 생성"""
+        return cls.from_records(
+            zip(df["question_title"], df["clean_answer"], df["question_link"])
+        )
+
+    def __len__(self) -> int:
+        return (len(self.offsets) - 1) // len(FIELDS)
+
+    def __getitem__(self, doc_id: int) -> CorpusRecord:
+        if not 0 <= doc_id < len(self):
+            raise IndexError(f"문서 ID 범위를 벗어났습니다: {doc_id}")
+        return CorpusRecord(self, doc_id)
+
+    def __iter__(self):
+        return (CorpusRecord(self, doc_id) for doc_id in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """버퍼와 오프셋 배열의 바이트 수"""
+        return len(self.buffer) + self.offsets.nbytes
+
+    def view(self, doc_id: int, field: str) -> memoryview:
+        """문서 필드의 UTF-8 바이트 뷰 (복사 없음)"""
+        position = doc_id * len(FIELDS) + _FIELD_INDEX[field]
+        return self._view[self.offsets[position] : self.offsets[position + 1]]
+
+    def text(self, doc_id: int, field: str) -> str:
+        """문서 필드를 문자열로 디코딩"""
+        return str(self.view(doc_id, field), "utf-8")
+
+    def search_text(self, doc_id: int) -> str:
+        """임베딩할 검색용 텍스트 (질문과 답변을 결합)"""
+        return (
+            f"{self.text(doc_id, 'question_title')}\n"
+            f"{self.text(doc_id, 'clean_answer')}"
+        )
+
+    def result(self, doc_id: int, score: float) -> Dict:
+        """검색 결과 딕셔너리 (VectorStore 결과와 같은 형태)"""
+        return {
+            "question": self.text(doc_id, "question_title"),
+            "answer": self.text(doc_id, "clean_answer"),
+            "link": self.text(doc_id, "question_link"),
+            "similarity_score": float(score),
+        }
+
+    def take(self, doc_ids: Sequence[int]) -> "CompactCorpus":
+        """주어진 ID 순서대로 문서를 골라 새 말뭉치 생성 (새 ID는 0부터)"""
+        builder = CorpusBuilder()
+        for doc_id in doc_ids:
+            builder.add(*(self.text(doc_id, field) for field in FIELDS))
+        return builder.build()
+
+    def save(self, directory: str):
+        """디렉터리에 버퍼와 오프셋 배열 저장"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, BUFFER_FILE), "wb") as f:
+            f.write(self._view)
+        np.save(os.path.join(directory, OFFSETS_FILE), np.asarray(self.offsets))
+
+    @classmethod
+    def load(cls, directory: str, use_mmap: bool = True) -> "CompactCorpus":
+        """
+        저장된 말뭉치 로드
+
+        Args:
+            directory: save로 저장한 디렉터리
+            use_mmap: 파일을 메모리에 매핑하여 필요한 페이지만 읽을지 여부
+                (여러 프로세스가 같은 페이지를 공유)
+        """
+        offsets = np.load(
+            os.path.join(directory, OFFSETS_FILE), mmap_mode="r" if use_mmap else None
+        )
+        with open(os.path.join(directory, BUFFER_FILE), "rb") as f:
+            # 빈 파일은 mmap할 수 없으므로 빈 버퍼로 대체
+            if use_mmap and os.fstat(f.fileno()).st_size:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+        return cls(buffer, offsets)
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, OFFSETS_FILE))
@@ -0,0 +1,119 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# 게이트 결정
+DIRECT = "direct"  # 거의 동일한 질문 → 채택된 답변을 그대로 제공
+NO_MATCH = "no_match"  # 관련 결과 없음 → LLM 없이 즉시 안내
+GENERATE = "generate"  # 검색 결과를 컨텍스트로 LLM 답변 생성
+
+NO_MATCH_MESSAGE = (
+    "관련된 스택오버플로우 답변을 찾지 못했습니다. "
+    "질문을 더 구체적으로 작성하거나 다른 프로그래밍 언어를 선택해 보세요."
+)
+
+
+@dataclass
+class GateDecision:
+    """검색 점수를 바탕으로 한 답변 방식 결정"""
+
+    action: str
+    results: List[Dict] = field(default_factory=list)
+    # LLM 없이 바로 제공할 답변 (action이 generate이면 None)
+    answer: Optional[str] = None
+
+
+class ConfidenceGate:
+    """
+    검색 결과의 유사도 점수(L2 거리, 낮을수록 유사)로 LLM 호출 여부와
+    컨텍스트 수를 결정하는 단계
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        direct_threshold: Optional[float] = None,
+        no_match_threshold: Optional[float] = None,
+        context_threshold: float = 0.65,
+        min_k: int = 1,
+        max_k: int = 5,
+        default_k: int = 3,
+    ):
+        """
+        Args:
+            enabled: 게이트 사용 여부 (None이면 QA_CONFIDENCE_GATE 환경 변수, 기본값 사용)
+            direct_threshold: 최상위 거리가 이 값 이하이면 채택 답변을 그대로 제공
+                (None이면 QA_GATE_DIRECT_THRESHOLD, 기본값 0.1)
+            no_match_threshold: 최상위 거리가 이 값을 넘으면 관련 결과 없음으로 응답
+                (None이면 QA_GATE_NO_MATCH_THRESHOLD, 기본값 0.8)
+            context_threshold: 컨텍스트로 사용할 결과의 최대 거리
+                (화면의 유사도 "낮음" 경계와 같은 0.65)
+            min_k: 답변 생성 시 사용할 최소 컨텍스트 수
+            max_k: 검색할 후보 수이자 최대 컨텍스트 수
+            default_k: 게이트를 끈 경우의 고정 검색 결과 수
+        """
+        if enabled is None:
+            enabled = os.getenv("QA_CONFIDENCE_GATE", "true").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        if direct_threshold is None:
+            direct_threshold = float(os.getenv("QA_GATE_DIRECT_THRESHOLD", "0.1"))
+        if no_match_threshold is None:
+            no_match_threshold = float(os.getenv("QA_GATE_NO_MATCH_THRESHOLD", "0.8"))
+
+        self.enabled = enabled
+        self.direct_threshold = direct_threshold
+        self.no_match_threshold = no_match_threshold
+        self.context_threshold = context_threshold
+        self.min_k = min_k
+        self.max_k = max_k
+        self.default_k = default_k
+
+    @property
+    def retrieval_k(self) -> int:
+        """검색 단계에서 가져올 후보 수"""
+        return self.max_k if self.enabled else self.default_k
+
+    def decide(self, results: List[Dict]) -> GateDecision:
+        """
+        검색 결과로 답변 방식 결정
+
+        결과의 순서는 바꾸지 않는다. 두 벡터 스토어는 거리순으로, 자동 라우팅은
+        보정 점수(calibrated_score)순으로 정렬된 결과를 반환하므로 최상위 결과가
+        라우터가 고른 언어와 일치해야 한다. 같은 결과에 다시 적용해도 같은 결정이
+        나오므로, 검색 단계에서 줄인 결과를 답변 단계에 넘겨도 결정이 바뀌지 않는다.
+
+        Args:
+            results: similarity_score를 포함한 정렬된 검색 결과 리스트
+        Returns:
+            GateDecision (results는 답변에 사용할 컨텍스트)
+        """
+        if not self.enabled:
+            return GateDecision(GENERATE, results)
+
+        if not results or results[0]["similarity_score"] > self.no_match_threshold:
+            return GateDecision(NO_MATCH, [], NO_MATCH_MESSAGE)
+
+        best = results[0]
+        if best["similarity_score"] <= self.direct_threshold:
+            return GateDecision(DIRECT, [best], self._format_direct_answer(best))
+
+        # 최상위 결과는 항상 유지하고, 나머지는 충분히 가까운 결과만 사용
+        # (최소 min_k, 최대 max_k)
+        contexts = [best] + [
+            result
+            for result in results[1 : self.max_k]
+            if result["similarity_score"] <= self.context_threshold
+        ]
+        if len(contexts) < self.min_k:
+            contexts = results[: self.min_k]
+        return GateDecision(GENERATE, contexts)
+
+    def _format_direct_answer(self, result: Dict) -> str:
+        return (
+            f"스택오버플로우에서 거의 같은 질문을 찾았습니다: **{result['question']}**\n\n"
+            f"{result['answer']}\n\n"
+            f"원본: {result['link']}"
+        )
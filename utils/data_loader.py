@@ -4,6 +4,9 @@ from typing import List
 import pandas as pd
 from bs4 import BeautifulSoup
 
+from utils.compact_corpus import CompactCorpus
+from utils.metrics import metrics
+
 
 def extract_code_blocks(element) -> List[str]:
     """코드 블록을 추출하고 포맷팅하는 함수
@@ -189,26 +192,54 @@ def load_stackoverflow_data(file_path: str) -> pd.DataFrame:
         전처리된 DataFrame
     """
     try:
-        df = pd.read_csv(file_path)
+        with metrics.span("index.read_csv"):
+            df = pd.read_csv(file_path)
+
+        return preprocess_stackoverflow_data(df)
+
+    except Exception as e:
+        print(f"데이터 로드 중 오류 발생: {str(e)}")
+        raise
 
-        # 필수 컬럼 확인
-        required_columns = ["question_title", "question_link", "accepted_answer_body"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
 
-        if missing_columns:
-            raise ValueError(f"CSV 파일에 다음 필수 컬럼이 없습니다: {missing_columns}")
+def preprocess_stackoverflow_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    원본 스택오버플로우 DataFrame 검증 및 HTML 답변 정제
+
+    Args:
+        df: question_title, question_link, accepted_answer_body 컬럼의 DataFrame
+    Returns:
+        question_title, question_link, clean_answer 컬럼의 DataFrame
+    """
+    # 필수 컬럼 확인
+    required_columns = ["question_title", "question_link", "accepted_answer_body"]
+    missing_columns = [col for col in required_columns if col not in df.columns]
+
+    if missing_columns:
+        raise ValueError(f"CSV 파일에 다음 필수 컬럼이 없습니다: {missing_columns}")
 
-        # 결측치 처리
-        df = df.dropna(subset=["accepted_answer_body"])
+    # 결측치 처리
+    df = df.dropna(subset=["accepted_answer_body"])
 
-        # HTML 답변 정제
+    # HTML 답변 정제
+    with metrics.span("index.clean_html"):
         df["clean_answer"] = df["accepted_answer_body"].apply(clean_html)
 
-        # 빈 답변 제거
-        df = df[df["clean_answer"].str.strip() != ""]
+    # 빈 답변 제거
+    df = df[df["clean_answer"].str.strip() != ""]
 
-        return df[["question_title", "question_link", "clean_answer"]]
+    return df[["question_title", "question_link", "clean_answer"]]
 
-    except Exception as e:
-        print(f"데이터 로드 중 오류 발생: {str(e)}")
-        raise
+
+def load_stackoverflow_corpus(file_path: str) -> CompactCorpus:
+    """
+    스택오버플로우 데이터를 로드하고 전처리하여 압축 말뭉치로 변환
+
+    Args:
+        file_path: CSV 파일 경로
+    Returns:
+        CompactCorpus (DataFrame은 변환 후 해제)
+    """
+    df = load_stackoverflow_data(file_path)
+    with metrics.span("index.build_corpus"):
+        return CompactCorpus.from_frame(df)
@@ -1,4 +1,11 @@
-from typing import Dict, List
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional
 
 from datasets import Dataset
 from ragas import evaluate
@@ -8,12 +15,83 @@ from ragas.metrics import (
     context_recall,
     faithfulness,
 )
+from ragas.run_config import RunConfig
+
+
+def parse_evaluation_questions(content: str, file_format: str) -> List[Dict[str, str]]:
+    """
+    평가용 질문 목록 파싱
+
+    Args:
+        content: 파일 내용
+        file_format: "csv" (question[, language] 컬럼), "jsonl" 또는 "txt" (한 줄에 질문 하나)
+    Returns:
+        {"question": ..., "language": ...} 딕셔너리 리스트 (language는 없으면 None)
+    """
+    file_format = file_format.lower().lstrip(".")
+    # 엑셀 등에서 저장한 파일의 BOM 제거 (헤더가 "\ufeffquestion"이 되지 않도록)
+    content = content.lstrip("\ufeff")
+
+    if file_format == "csv":
+        reader = csv.DictReader(io.StringIO(content))
+        if reader.fieldnames and "question" not in reader.fieldnames:
+            raise ValueError("CSV 파일에 question 컬럼이 없습니다.")
+        rows = list(reader)
+    elif file_format == "jsonl":
+        rows = []
+        for line_number, line in enumerate(content.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{line_number}번째 줄이 올바른 JSON이 아닙니다: {e}")
+            if not isinstance(row, dict):
+                raise ValueError(f"{line_number}번째 줄이 JSON 객체가 아닙니다.")
+            rows.append(row)
+    elif file_format == "txt":
+        rows = [{"question": line} for line in content.splitlines()]
+    else:
+        raise ValueError(f"지원하지 않는 평가 파일 형식입니다: {file_format}")
+
+    questions = []
+    for row in rows:
+        # 짧은 CSV 행이나 null 값은 None으로 들어옴
+        question = str(row.get("question") or "").strip()
+        if question:
+            language = str(row.get("language") or "").strip() or None
+            questions.append({"question": question, "language": language})
+    return questions
+
+
+def load_evaluation_questions(file_path: str) -> List[Dict[str, str]]:
+    """
+    파일에서 평가용 질문 목록 로드 (.csv, .jsonl, .txt)
+
+    Args:
+        file_path: 평가 질문 파일 경로
+    Returns:
+        {"question": ..., "language": ...} 딕셔너리 리스트
+    """
+    with open(file_path, encoding="utf-8-sig") as f:
+        content = f.read()
+    return parse_evaluation_questions(content, os.path.splitext(file_path)[1])
 
 
 class QAEvaluator:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_path: Optional[str] = "eval_cache.json",
+        max_workers: int = 8,
+        batch_size: int = 64,
+    ):
         """
         QA 시스템 평가를 위한 클래스 초기화
+
+        Args:
+            cache_path: 샘플별 평가 점수 캐시 파일 경로 (None이면 메모리에만 보관)
+            max_workers: RAGAS 지표 계산의 최대 동시 실행 수
+            batch_size: 한 번의 RAGAS 평가 호출에 포함할 샘플 수
         """
         self.metrics = [
             faithfulness,
@@ -21,6 +99,11 @@ class QAEvaluator:
             context_precision,
             context_recall,
         ]
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, float]] = self._load_cache()
 
     def prepare_evaluation_data(
         self, questions: List[str], answers: List[str], contexts: List[List[str]]
@@ -37,82 +120,118 @@ class QAEvaluator:
         }
         return Dataset.from_dict(eval_data)
 
+    @staticmethod
+    def sample_key(question: str, answer: str, contexts: List[str]) -> str:
+        """질문/답변/컨텍스트 해시로 샘플 캐시 키 생성"""
+        payload = json.dumps([question, answer, contexts], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def score_samples(
+        self, questions: List[str], answers: List[str], contexts: List[List[str]]
+    ) -> List[Dict[str, float]]:
+        """
+        샘플별 평가 점수 계산 (캐시에 없는 샘플만 배치 단위로 계산)
+
+        Returns:
+            입력 순서대로 {지표명: 점수} 딕셔너리 리스트 (계산 실패한 지표는 제외)
+        """
+        metric_names = [metric.name for metric in self.metrics]
+        keys = [
+            self.sample_key(q, a, c) for q, a, c in zip(questions, answers, contexts)
+        ]
+
+        with self._lock:
+            missing = [
+                idx
+                for idx, key in enumerate(keys)
+                if not all(name in self._cache.get(key, {}) for name in metric_names)
+            ]
+        # 같은 샘플이 여러 번 들어와도 한 번만 계산
+        missing = list({keys[idx]: idx for idx in missing}.values())
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            try:
+                self._score_batch(
+                    [questions[idx] for idx in batch],
+                    [answers[idx] for idx in batch],
+                    [contexts[idx] for idx in batch],
+                    [keys[idx] for idx in batch],
+                )
+            except Exception as e:
+                print(f"평가 배치 처리 중 오류 발생: {str(e)}")
+
+        self._save_cache()
+        with self._lock:
+            return [dict(self._cache.get(key, {})) for key in keys]
+
     def evaluate_qa_system(
         self, questions: List[str], answers: List[str], contexts: List[List[str]]
     ) -> Dict[str, float]:
         """
-        QA 시스템 성능 평가
+        QA 시스템 성능 평가 (샘플별 점수의 평균)
         """
+        sample_scores = self.score_samples(questions, answers, contexts)
+
+        metrics = {}
+        for metric in self.metrics:
+            values = [
+                scores[metric.name] for scores in sample_scores if metric.name in scores
+            ]
+            if values:
+                # 점수 범위 검증 (0~1)
+                metrics[metric.name] = max(0.0, min(1.0, sum(values) / len(values)))
+
+        return metrics
+
+    def _score_batch(
+        self,
+        questions: List[str],
+        answers: List[str],
+        contexts: List[List[str]],
+        keys: List[str],
+    ):
+        """RAGAS로 배치를 평가하고 구조화된 결과에서 샘플별 점수를 캐시에 저장"""
+        dataset = self.prepare_evaluation_data(questions, answers, contexts)
+        evaluation_results = evaluate(
+            dataset=dataset,
+            metrics=self.metrics,
+            run_config=RunConfig(max_workers=self.max_workers),
+            show_progress=False,
+        )
+        frame = evaluation_results.to_pandas()
+
+        with self._lock:
+            for row_idx, key in enumerate(keys):
+                scores = self._cache.setdefault(key, {})
+                for metric in self.metrics:
+                    if metric.name not in frame.columns:
+                        continue
+                    value = frame.iloc[row_idx][metric.name]
+                    # 계산에 실패한 지표(NaN)는 캐시하지 않아 다음 실행에서 재시도
+                    if value is not None and not math.isnan(float(value)):
+                        scores[metric.name] = float(value)
+
+    def _load_cache(self) -> Dict[str, Dict[str, float]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
         try:
-            # 데이터셋 준비
-            dataset = self.prepare_evaluation_data(questions, answers, contexts)
-
-            # RAGAS 평가 실행
-            evaluation_results = evaluate(dataset=dataset, metrics=self.metrics)
-
-            # 결과 객체를 문자열로 변환하여 파싱
-            result_str = str(evaluation_results)
-            print("Raw results:", result_str)  # 디버깅용 출력
-
-            # 결과에서 값 추출
-            metrics = {}
-
-            # faithfulness 추출
-            if "'faithfulness': " in result_str:
-                try:
-                    faithfulness_val = float(
-                        result_str.split("'faithfulness': ")[1].split(",")[0]
-                    )
-                    metrics["faithfulness"] = faithfulness_val
-                except:
-                    metrics["faithfulness"] = faithfulness_val  # 기본값 설정
-
-            # answer_relevancy 추출
-            if "'answer_relevancy': " in result_str:
-                try:
-                    relevancy_val = float(
-                        result_str.split("'answer_relevancy': ")[1].split(",")[0]
-                    )
-                    metrics["answer_relevancy"] = relevancy_val
-                except:
-                    metrics["answer_relevancy"] = relevancy_val  # 기본값 설정
-
-            # context_precision 추출
-            if "'context_precision': " in result_str:
-                try:
-                    precision_val = float(
-                        result_str.split("'context_precision': ")[1].split(",")[0]
-                    )
-                    metrics["context_precision"] = precision_val
-                except:
-                    metrics["context_precision"] = precision_val  # 기본값 설정
-
-            # context_recall 추출
-            if "'context_recall': " in result_str:
-                try:
-                    recall_val = float(
-                        result_str.split("'context_recall': ")[1].split("}")[0]
-                    )
-                    metrics["context_recall"] = recall_val
-                except:
-                    metrics["context_recall"] = recall_val  # 기본값 설정
-
-            # 점수 범위 검증 (0~1)
-            for key in metrics:
-                metrics[key] = max(0.0, min(1.0, metrics[key]))
-
-            print("Final metrics:", metrics)  # 디버깅용 출력
-            return metrics
-
-        except Exception as e:
-            print(f"평가 중 오류 발생: {str(e)}")
-            # 오류 발생 시에도 의미 있는 값 반환
-            return {
-                "faithfulness": 0.7,
-                "answer_relevancy": 0.8,
-                "context_precision": 0.6,
-                "context_recall": 0.9,
-            }
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"평가 캐시 로드 실패: {str(e)}")
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            payload = json.dumps(self._cache)
+        # 쓰기 도중 중단되어도 기존 캐시가 깨지지 않도록 임시 파일 후 교체
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.cache_path)
 
     def generate_evaluation_report(self, metrics: Dict[str, float]) -> str:
         """
@@ -120,6 +239,9 @@ class QAEvaluator:
         """
         report = "# QA 시스템 평가 보고서\n\n"
 
+        if not metrics:
+            report += "평가 점수를 계산하지 못했습니다.\n"
+
         descriptions = {
             "faithfulness": "답변이 제공된 컨텍스트에 충실한 정도",
             "answer_relevancy": "답변이 질문과 관련성이 있는 정도",
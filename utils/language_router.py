@@ -0,0 +1,135 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from utils.metrics import metrics
+
+
+def winning_language(results: List[Dict], default: str) -> str:
+    """자동 라우팅 결과에서 최상위 결과의 언어 반환 (결과가 없으면 default)"""
+    if results and "language" in results[0]:
+        return results[0]["language"]
+    return default
+
+
+class LanguageRouter:
+    """
+    질문을 한 번만 임베딩하고 모든 언어 인덱스를 동시에 검색하여
+    보정된 점수로 결과를 병합하는 자동 언어 라우터
+    """
+
+    def __init__(self, vector_stores: Dict, sample_size: int = 128):
+        """
+        Args:
+            vector_stores: 언어별 벡터 스토어 (search_by_vector를 제공)
+            sample_size: 점수 보정용 최근접 이웃 거리 표본 수
+        """
+        self.vector_stores = vector_stores
+        self.sample_size = sample_size
+        self._scales: Optional[Dict[str, float]] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(vector_stores)), thread_name_prefix="router"
+        )
+
+    @property
+    def embeddings(self):
+        # 모든 언어 인덱스는 같은 임베딩 모델로 만들어짐
+        return next(iter(self.vector_stores.values())).embeddings
+
+    def scales(self) -> Dict[str, float]:
+        """
+        언어별 점수 보정 계수 (최근접 이웃 거리 중앙값, 처음 사용할 때 한 번 계산)
+
+        인덱스마다 문서 밀도가 달라 원시 L2 거리를 그대로 비교할 수 없으므로,
+        각 인덱스의 일반적인 이웃 간 거리로 나누어 같은 척도로 맞춘다.
+        """
+        if self._scales is None:
+            with self._lock:
+                if self._scales is None:
+                    with metrics.span("routing.calibrate"):
+                        scales = {}
+                        for lang, store in self.vector_stores.items():
+                            scale = store.neighbor_distance_scale(self.sample_size)
+                            scales[lang] = scale if scale > 0 else 1.0
+                    self._scales = scales
+        return self._scales
+
+    def route(self, question: str, k: int = 3) -> Tuple[Optional[str], List[Dict]]:
+        """
+        질문을 모든 언어 인덱스에서 검색하고 가장 관련 있는 언어 선택
+
+        Args:
+            question: 사용자 질문
+            k: 반환할 결과 수
+        Returns:
+            (최상위 결과의 언어, 보정 점수 순으로 병합된 결과 리스트)
+        """
+        scales = self.scales()
+        with metrics.span("routing"):
+            with metrics.span("routing.embed_query"):
+                embedding = self.embeddings.embed_query(question)
+
+            with metrics.span("routing.fan_out"):
+                # 스레드에서도 같은 요청의 샘플링 결정을 따르도록 컨텍스트 복사
+                futures = {
+                    lang: self._executor.submit(
+                        contextvars.copy_context().run,
+                        self._search,
+                        lang,
+                        store,
+                        embedding,
+                        k,
+                    )
+                    for lang, store in self.vector_stores.items()
+                }
+                per_language = {lang: f.result() for lang, f in futures.items()}
+
+            return self._merge(per_language, scales, k)
+
+    async def aroute(
+        self, question: str, k: int = 3
+    ) -> Tuple[Optional[str], List[Dict]]:
+        """질문 자동 라우팅 (비동기)"""
+        scales = await asyncio.to_thread(self.scales)
+        with metrics.span("routing"):
+            with metrics.span("routing.embed_query"):
+                embedding = await self.embeddings.aembed_query(question)
+
+            with metrics.span("routing.fan_out"):
+                outputs = await asyncio.gather(
+                    *[
+                        asyncio.to_thread(self._search, lang, store, embedding, k)
+                        for lang, store in self.vector_stores.items()
+                    ]
+                )
+            per_language = dict(zip(self.vector_stores, outputs))
+
+            return self._merge(per_language, scales, k)
+
+    def _search(self, lang: str, store, embedding: List[float], k: int) -> List[Dict]:
+        with metrics.span(f"routing.search.{lang}"):
+            return store.search_by_vector(embedding, k)
+
+    def _merge(
+        self, per_language: Dict[str, List[Dict]], scales: Dict[str, float], k: int
+    ) -> Tuple[Optional[str], List[Dict]]:
+        """언어별 결과에 언어와 보정 점수를 붙여 병합"""
+        merged = [
+            {
+                **result,
+                "language": lang,
+                "calibrated_score": result["similarity_score"] / scales[lang],
+            }
+            for lang, results in per_language.items()
+            for result in results
+        ]
+        merged.sort(key=lambda result: result["calibrated_score"])
+        merged = merged[:k]
+
+        language = merged[0]["language"] if merged else None
+        if language is not None:
+            metrics.increment("routing.selected", labels={"language": language})
+        return language, merged
@@ -0,0 +1,6 @@
+# 지원하는 프로그래밍 언어 (언어별로 별도의 인덱스를 사용)
+# 무거운 모듈을 불러오지 않고도 UI에서 참조할 수 있도록 별도 모듈로 분리
+LANGUAGES = ["c#", "javascript", "java"]
+
+# 질문을 모든 언어 인덱스에서 검색하여 언어를 자동으로 선택하는 라우팅 모드
+AUTO_LANGUAGE = "auto"
@@ -1,28 +1,63 @@
-from typing import Dict, List
+import asyncio
+import os
+import random
+import time
+import weakref
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
 from langchain.callbacks import LangChainTracer
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langsmith import Client
 
+from utils.metrics import metrics
+
 
 class LLMChain:
-    def __init__(self, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        max_concurrency: int = 8,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        enable_tracing: Optional[bool] = None,
+        llm: Optional[BaseChatModel] = None,
+    ):
         """
         LLM 체인 초기화
 
         Args:
             model: 사용할 OpenAI 모델명
+            max_concurrency: 비동기 호출의 최대 동시 실행 수
+            timeout: 비동기 호출 1회당 타임아웃(초)
+            max_retries: 비동기 호출 실패 시 재시도 횟수 (타임아웃 포함).
+                ChatOpenAI 클라이언트도 연결 오류/429/5xx에 대해 자체적으로
+                재시도(기본 2회)하므로, 비동기 경로의 최대 API 호출 수는
+                (max_retries + 1) * (클라이언트 재시도 + 1)이다. 동기/스트리밍
+                경로는 클라이언트 재시도만 사용한다.
+            enable_tracing: Langsmith 외부 트레이싱 사용 여부
+                (None이면 QA_EXTERNAL_TRACING 환경 변수를 따르며 기본값은 사용)
+            llm: 사용할 채팅 모델 (부하 테스트용 스텁 등, 생략 시 ChatOpenAI 생성)
         """
+        if enable_tracing is None:
+            enable_tracing = os.getenv("QA_EXTERNAL_TRACING", "true").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+
         # Langsmith 트레이서 설정 - 예외 처리 추가
-        try:
-            tracer = LangChainTracer(project_name="stackoverflow_qa_project")
-            callbacks = [tracer]
-        except Exception as e:
-            print(f"Langsmith 트레이서 초기화 실패: {str(e)}")
-            callbacks = []
+        callbacks = []
+        if enable_tracing:
+            try:
+                tracer = LangChainTracer(project_name="stackoverflow_qa_project")
+                callbacks = [tracer]
+            except Exception as e:
+                print(f"Langsmith 트레이서 초기화 실패: {str(e)}")
 
-        self.llm = ChatOpenAI(
+        # 클라이언트 자체 재시도는 동기/스트리밍 경로의 유일한 재시도이므로 유지
+        self.llm = llm or ChatOpenAI(
             model=model,
             callbacks=callbacks,
             tags=["stackoverflow_qa"],
@@ -74,6 +109,19 @@ class LLMChain:
             """,
         }
 
+        # 언어별 프롬프트 템플릿을 미리 구성하여 요청마다 다시 파싱하지 않음
+        # (프롬프트 구성과 LLM 호출을 단계별로 계측하기 위해 체인 대신 분리하여 호출)
+        self.prompt_templates = {
+            language: ChatPromptTemplate.from_template(template)
+            for language, template in self.prompts.items()
+        }
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # 세마포어는 이벤트 루프에 묶이므로 루프별로 생성
+        self._semaphores = weakref.WeakKeyDictionary()
+
     def generate_response(
         self, question: str, similar_results: List[Dict], language: str
     ) -> str:
@@ -88,24 +136,184 @@ class LLMChain:
             LLM이 생성한 답변
         """
         try:
-            # 컨텍스트 생성
-            context = "\n\n".join(
-                [
-                    f"질문: {result['question']}\n답변: {result['answer']}"
-                    for result in similar_results
-                ]
-            )
-
-            # 언어별 프롬프트 선택
-            prompt = ChatPromptTemplate.from_template(self.prompts[language])
+            with metrics.span("generation"):
+                # 컨텍스트 생성 및 언어별 프롬프트 구성
+                prompt = self._build_prompt(question, similar_results, language)
 
-            # 프롬프트 생성 및 LLM 호출
-            chain = prompt | self.llm
-
-            response = chain.invoke({"question": question, "context": context})
+                # LLM 호출
+                with metrics.span("generation.llm_call"):
+                    response = self.llm.invoke(prompt)
 
             return response.content
 
         except Exception as e:
             print(f"LLM 응답 생성 중 오류 발생: {str(e)}")
             return "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
+
+    async def agenerate_response(
+        self, question: str, similar_results: List[Dict], language: str
+    ) -> str:
+        """
+        LLM 응답 비동기 생성
+
+        세마포어로 동시 호출 수를 제한하고, 호출마다 타임아웃을 적용하며
+        실패 시 지터가 포함된 지수 백오프로 재시도
+
+        Args:
+            question: 사용자 질문
+            similar_results: 유사한 질문/답변 목록
+            language: 프로그래밍 언어
+        Returns:
+            LLM이 생성한 답변
+        """
+        with metrics.span("generation"):
+            prompt = self._build_prompt(question, similar_results, language)
+
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with self._get_semaphore():
+                        with metrics.span("generation.llm_call"):
+                            response = await asyncio.wait_for(
+                                self.llm.ainvoke(prompt), timeout=self.timeout
+                            )
+                    return response.content
+
+                except Exception as e:
+                    print(
+                        f"LLM 비동기 응답 생성 중 오류 발생 "
+                        f"({attempt + 1}/{self.max_retries + 1}): "
+                        f"{str(e) or type(e).__name__}"
+                    )
+                    if attempt < self.max_retries:
+                        metrics.increment("generation.retries")
+                        # full jitter 백오프: 0 ~ 0.5 * 2^attempt 초
+                        await asyncio.sleep(random.uniform(0, 0.5 * 2**attempt))
+
+        metrics.increment("generation.failures")
+        return "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
+
+    def stream_response(
+        self,
+        question: str,
+        similar_results: List[Dict],
+        language: str,
+        stats: Optional[Dict[str, float]] = None,
+    ) -> Iterator[str]:
+        """
+        LLM 응답을 토큰 단위로 스트리밍
+
+        Args:
+            question: 사용자 질문
+            similar_results: 유사한 질문/답변 목록
+            language: 프로그래밍 언어
+            stats: 전달 시 time_to_first_token, total_time(초)을 기록할 딕셔너리
+        Returns:
+            LLM이 생성하는 토큰 문자열 이터레이터
+        """
+        start = time.perf_counter()
+        first_token_at = None
+        # 스트림은 스팬으로 감쌀 수 없으므로 시작 시점에 샘플링 여부를 결정
+        sampled = metrics.is_sampled()
+
+        try:
+            prompt = self._build_prompt(question, similar_results, language)
+
+            for chunk in self.llm.stream(prompt):
+                if not chunk.content:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                yield chunk.content
+
+        except Exception as e:
+            print(f"LLM 스트리밍 중 오류 발생: {str(e)}")
+            yield "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
+
+        finally:
+            self._record_stream_stats(start, first_token_at, stats, sampled)
+
+    async def astream_response(
+        self,
+        question: str,
+        similar_results: List[Dict],
+        language: str,
+        stats: Optional[Dict[str, float]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        LLM 응답을 토큰 단위로 비동기 스트리밍 (동시 실행 수는 세마포어로 제한)
+
+        Args:
+            question: 사용자 질문
+            similar_results: 유사한 질문/답변 목록
+            language: 프로그래밍 언어
+            stats: 전달 시 time_to_first_token, total_time(초)을 기록할 딕셔너리
+        Returns:
+            LLM이 생성하는 토큰 문자열 비동기 이터레이터
+        """
+        start = time.perf_counter()
+        first_token_at = None
+        # 스트림은 스팬으로 감쌀 수 없으므로 시작 시점에 샘플링 여부를 결정
+        sampled = metrics.is_sampled()
+
+        try:
+            prompt = self._build_prompt(question, similar_results, language)
+
+            async with self._get_semaphore():
+                async for chunk in self.llm.astream(prompt):
+                    if not chunk.content:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    yield chunk.content
+
+        except Exception as e:
+            print(f"LLM 비동기 스트리밍 중 오류 발생: {str(e)}")
+            yield "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
+
+        finally:
+            self._record_stream_stats(start, first_token_at, stats, sampled)
+
+    def _record_stream_stats(
+        self,
+        start: float,
+        first_token_at: Optional[float],
+        stats: Optional[Dict[str, float]],
+        sampled: bool,
+    ):
+        """스트리밍 첫 토큰 지연과 전체 생성 시간 기록 (지표는 샘플링된 요청만)"""
+        end = time.perf_counter()
+        time_to_first_token = (first_token_at or end) - start
+        if sampled:
+            metrics.observe("generation.time_to_first_token", time_to_first_token)
+            metrics.observe("generation.stream_total", end - start)
+        if stats is not None:
+            stats["time_to_first_token"] = time_to_first_token
+            stats["total_time"] = end - start
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """현재 이벤트 루프에 해당하는 동시성 제한 세마포어 반환"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _build_prompt(
+        self, question: str, similar_results: List[Dict], language: str
+    ):
+        """컨텍스트를 조합하여 언어별 프롬프트 값 생성"""
+        with metrics.span("generation.prompt_build"):
+            context = self._build_context(similar_results)
+            return self.prompt_templates[language].invoke(
+                {"question": question, "context": context}
+            )
+
+    def _build_context(self, similar_results: List[Dict]) -> str:
+        """검색 결과를 프롬프트 컨텍스트 문자열로 변환"""
+        return "\n\n".join(
+            [
+                f"질문: {result['question']}\n답변: {result['answer']}"
+                for result in similar_results
+            ]
+        )
@@ -0,0 +1,280 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+# 현재 요청(루트 스팬)이 샘플링 대상인지 여부 - 하위 스팬은 루트의 결정을 따름
+_sampled: ContextVar[Optional[bool]] = ContextVar("qa_metrics_sampled", default=None)
+
+# Prometheus 지표 이름에 허용되지 않는 문자
+_INVALID_METRIC_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: _Labels) -> str:
+    """레이블을 Prometheus 형식 문자열로 변환 (예: {language="c#"})"""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    """단계별 지연 시간 분포 (최근 샘플을 고정 크기 버퍼에 보관)"""
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)) -> Dict[float, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in qs}
+        # nearest-rank 방식 백분위수
+        return {
+            q: ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+            for q in qs
+        }
+
+
+class MetricsRegistry:
+    """
+    외부 서비스 없이 프로세스 내에서 단계별 지연 시간과 카운터를 수집하는 레지스트리
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, sample_rate: float = 1.0, max_samples: int = 4096):
+        """
+        Args:
+            sample_rate: 지연 시간을 기록할 요청 비율 (0~1, 루트 스팬 단위로 결정)
+            max_samples: 단계별로 보관할 최근 샘플 수
+        """
+        self.sample_rate = sample_rate
+        self.max_samples = max_samples
+        self._histograms: Dict[str, _Histogram] = {}
+        self._counters: Dict[Tuple[str, _Labels], float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        코드 블록의 실행 시간을 stage 이름으로 기록하는 컨텍스트 매니저
+
+        Args:
+            stage: 단계 이름 (예: "retrieval.faiss_search")
+        """
+        token = None
+        sampled = self.is_sampled()
+        if _sampled.get() is None:
+            token = _sampled.set(sampled)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if sampled:
+                self.observe(stage, time.perf_counter() - start)
+            if token is not None:
+                _sampled.reset(token)
+
+    def is_sampled(self) -> bool:
+        """
+        현재 요청의 지연 시간을 기록할지 여부
+
+        루트 스팬 안이면 그 결정을 따르고, 밖이면 sample_rate로 새로 결정한다.
+        """
+        sampled = _sampled.get()
+        if sampled is None:
+            return random.random() < self.sample_rate
+        return sampled
+
+    def observe(self, stage: str, seconds: float):
+        """단계 지연 시간(초)을 직접 기록 (샘플링과 무관하게 항상 기록)"""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = _Histogram(self.max_samples)
+            histogram.observe(seconds)
+
+    def increment(
+        self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None
+    ):
+        """
+        카운터 증가 (카운터는 샘플링하지 않음)
+
+        Args:
+            name: 카운터 이름 (예: "gate.decisions")
+            value: 증가량
+            labels: 카운터를 구분할 레이블 (예: {"language": "c#"})
+        """
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """카운터 현재 값 반환"""
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            return self._counters.get(key, 0.0)
+
+    def reset(self):
+        """수집된 모든 지표 초기화"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """
+        현재 지표를 딕셔너리로 반환
+
+        Returns:
+            {"stages": {stage: {count, sum, p50, p95, p99}}, "counters": {...}}
+            (레이블이 있는 카운터는 'name{label="value"}' 형태의 키)
+        """
+        with self._lock:
+            stages = {}
+            for stage, histogram in sorted(self._histograms.items()):
+                quantiles = histogram.quantiles(self.QUANTILES)
+                stages[stage] = {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "p50": quantiles[0.5],
+                    "p95": quantiles[0.95],
+                    "p99": quantiles[0.99],
+                }
+            counters = {
+                name + _format_labels(labels): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+        return {"stages": stages, "counters": counters}
+
+    def export_json(self) -> str:
+        """지표를 JSON 문자열로 내보내기"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def export_prometheus(self, prefix: str = "qa") -> str:
+        """지표를 Prometheus 텍스트 포맷(summary/counter)으로 내보내기"""
+        snapshot = self.snapshot()
+        metric = f"{prefix}_stage_latency_seconds"
+        lines = [
+            f"# HELP {metric} Latency of each QA pipeline stage.",
+            f"# TYPE {metric} summary",
+        ]
+        for stage, values in snapshot["stages"].items():
+            for q in self.QUANTILES:
+                value = values[f"p{int(q * 100)}"]
+                lines.append(f'{metric}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {values["sum"]:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {values["count"]}')
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+        declared = set()
+        for (name, labels), value in counters:
+            counter = _INVALID_METRIC_CHARS.sub("_", f"{prefix}_{name}_total")
+            if counter not in declared:
+                declared.add(counter)
+                lines.append(f"# TYPE {counter} counter")
+            lines.append(f"{counter}{_format_labels(labels)} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+def current_rss_bytes() -> int:
+    """
+    현재 프로세스의 RSS(상주 메모리) 바이트 수 반환
+
+    /proc을 사용할 수 없는 환경에서는 최대 RSS(ru_maxrss)로 대체
+    """
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    import resource
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def rss_breakdown() -> Dict[str, int]:
+    """
+    현재 프로세스의 RSS를 종류별 바이트 수로 반환 (Linux /proc 전용)
+
+    Returns:
+        {"rss", "anon", "file", "shmem"[, "pss"]} - anon은 프로세스 전용 메모리,
+        file/shmem은 다른 프로세스와 공유 가능한 매핑, pss는 공유 페이지를
+        공유 프로세스 수로 나눈 비례 메모리
+    """
+    fields = {
+        "VmRSS:": "rss",
+        "RssAnon:": "anon",
+        "RssFile:": "file",
+        "RssShmem:": "shmem",
+    }
+    breakdown = {"rss": current_rss_bytes(), "anon": 0, "file": 0, "shmem": 0}
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                name = line.split(maxsplit=1)[0] if line.strip() else ""
+                if name in fields:
+                    breakdown[fields[name]] = int(line.split()[1]) * 1024
+        with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    breakdown["pss"] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return breakdown
+
+
+class RssSampler(threading.Thread):
+    """작업 중 RSS 최댓값을 주기적으로 기록하는 백그라운드 스레드"""
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Args:
+            interval: 샘플링 간격(초)
+        """
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+
+# 프로세스 전역 레지스트리
+metrics = MetricsRegistry(
+    sample_rate=float(os.getenv("QA_METRICS_SAMPLE_RATE", "1.0")),
+)
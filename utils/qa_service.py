@@ -0,0 +1,271 @@
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from utils.confidence_gate import ConfidenceGate, GateDecision
+from utils.language_router import LanguageRouter, winning_language
+from utils.languages import AUTO_LANGUAGE
+from utils.metrics import metrics
+from utils.single_flight import (
+    SingleFlight,
+    answer_flight,
+    question_key,
+    retrieval_flight,
+)
+
+if TYPE_CHECKING:
+    # 타입 힌트 전용 - 이 모듈을 불러올 때 LangChain/FAISS를 함께 불러오지 않음
+    from utils.llm_chain import LLMChain
+    from utils.vector_store import VectorStore
+
+
+class QAService:
+    """
+    검색 + 답변 생성 파이프라인 (Streamlit, HTTP 서버, 부하 테스트에서 공통으로 사용)
+    """
+
+    def __init__(
+        self,
+        vector_stores: Dict[str, "VectorStore"],
+        llm_chain: Optional["LLMChain"] = None,
+        coalesce: bool = True,
+        gate: Optional[ConfidenceGate] = None,
+    ):
+        """
+        Args:
+            vector_stores: 언어별 벡터 스토어 (language="auto"이면 모든 스토어를 검색)
+            llm_chain: 답변 생성에 사용할 LLM 체인 (검색 전용으로 사용할 때는 생략)
+            coalesce: 동일한 질문의 동시 요청을 하나의 계산으로 병합할지 여부
+            gate: 검색 점수로 LLM 호출 여부와 컨텍스트 수를 정하는 단계
+                (생략 시 환경 변수 설정을 따르는 기본 게이트)
+        """
+        self.vector_stores = vector_stores
+        self.llm_chain = llm_chain
+        self.coalesce = coalesce
+        self.gate = gate or ConfidenceGate()
+        self.router = LanguageRouter(vector_stores)
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.vector_stores)
+
+    def retrieve(self, question: str, language: str) -> List[Dict]:
+        """
+        유사 질문 검색
+
+        Args:
+            question: 사용자 질문
+            language: 프로그래밍 언어 ("auto"이면 모든 언어를 검색하여 병합)
+        Returns:
+            유사 질문, 답변, 링크, 유사도 점수를 포함한 결과 리스트
+            (자동 라우팅 시 각 결과에 language, calibrated_score 포함,
+            게이트가 켜져 있으면 답변에 사용할 결과만 남김)
+        """
+        if language == AUTO_LANGUAGE:
+            return self.gate.decide(self.route(question)[1]).results
+
+        vector_store = self._get_vector_store(language)
+        results = self._coalesced(
+            retrieval_flight,
+            question_key(language, question),
+            lambda: vector_store.get_similar_questions(question, self.gate.retrieval_k),
+        )
+        return self.gate.decide(results).results
+
+    async def aretrieve(self, question: str, language: str) -> List[Dict]:
+        """유사 질문 비동기 검색"""
+        if language == AUTO_LANGUAGE:
+            return self.gate.decide((await self.aroute(question))[1]).results
+
+        vector_store = self._get_vector_store(language)
+        results = await self._acoalesced(
+            retrieval_flight,
+            question_key(language, question),
+            lambda: vector_store.aget_similar_questions(
+                question, self.gate.retrieval_k
+            ),
+        )
+        return self.gate.decide(results).results
+
+    def route(self, question: str) -> Tuple[Optional[str], List[Dict]]:
+        """
+        질문을 한 번 임베딩하여 모든 언어 인덱스를 동시에 검색
+
+        Returns:
+            (최상위 결과의 언어, 보정 점수 순으로 병합된 결과 리스트)
+        """
+        return self._coalesced(
+            retrieval_flight,
+            question_key(AUTO_LANGUAGE, question),
+            lambda: self.router.route(question, self.gate.retrieval_k),
+        )
+
+    async def aroute(self, question: str) -> Tuple[Optional[str], List[Dict]]:
+        """질문 자동 라우팅 (비동기)"""
+        return await self._acoalesced(
+            retrieval_flight,
+            question_key(AUTO_LANGUAGE, question),
+            lambda: self.router.aroute(question, self.gate.retrieval_k),
+        )
+
+    def prompt_language(self, language: str, similar_results: List[Dict]) -> str:
+        """답변 프롬프트에 사용할 언어 (자동 라우팅이면 최상위 결과의 언어)"""
+        if language == AUTO_LANGUAGE:
+            return winning_language(similar_results, self.languages[0])
+        return language
+
+    def process_question(self, question: str, language: str) -> Tuple[List[Dict], str]:
+        """
+        사용자 질문 처리 (검색 후 답변 생성)
+
+        Returns:
+            (유사 질문 결과 리스트, LLM 답변 또는 게이트가 바로 제공한 답변)
+        """
+        if language != AUTO_LANGUAGE:
+            self._get_vector_store(language)
+
+        def compute() -> Tuple[List[Dict], str]:
+            with metrics.span("process_question"):
+                decision = self._decide(self.retrieve(question, language))
+                if decision.answer is not None:
+                    return decision.results, decision.answer
+                llm_response = self.llm_chain.generate_response(
+                    question,
+                    decision.results,
+                    self.prompt_language(language, decision.results),
+                )
+            return decision.results, llm_response
+
+        return self._coalesced(answer_flight, question_key(language, question), compute)
+
+    async def aprocess_question(
+        self, question: str, language: str
+    ) -> Tuple[List[Dict], str]:
+        """사용자 질문 비동기 처리 (검색 후 답변 생성)"""
+        if language != AUTO_LANGUAGE:
+            self._get_vector_store(language)
+
+        async def compute() -> Tuple[List[Dict], str]:
+            with metrics.span("process_question"):
+                decision = self._decide(await self.aretrieve(question, language))
+                if decision.answer is not None:
+                    return decision.results, decision.answer
+                llm_response = await self.llm_chain.agenerate_response(
+                    question,
+                    decision.results,
+                    self.prompt_language(language, decision.results),
+                )
+            return decision.results, llm_response
+
+        return await self._acoalesced(
+            answer_flight, question_key(language, question), compute
+        )
+
+    def stream_answer(
+        self,
+        question: str,
+        language: str,
+        similar_results: List[Dict],
+        stats: Optional[Dict[str, float]] = None,
+    ) -> Iterator[str]:
+        """
+        검색 결과를 바탕으로 답변을 토큰 단위로 스트리밍
+
+        Args:
+            stats: time_to_first_token, total_time을 기록할 딕셔너리
+                (진행 중인 동일 질문의 스트림을 공유한 경우 기록되지 않음)
+        """
+        decision = self._decide(similar_results)
+        if decision.answer is not None:
+            _record_skipped_stats(stats)
+            return iter([decision.answer])
+
+        prompt_language = self.prompt_language(language, decision.results)
+
+        def stream() -> Iterator[str]:
+            return self.llm_chain.stream_response(
+                question, decision.results, prompt_language, stats=stats
+            )
+
+        if not self.coalesce:
+            return stream()
+        return answer_flight.stream(question_key(language, question), stream)
+
+    def retrieve_and_stream(
+        self,
+        question: str,
+        language: str,
+        stats: Optional[Dict[str, float]] = None,
+    ) -> Tuple[List[Dict], Iterator[str]]:
+        """
+        유사 질문을 검색한 뒤 그 결과로 답변 스트림 시작
+
+        Returns:
+            (유사 질문 결과 리스트, 답변 토큰 이터레이터)
+        """
+        similar_results = self.retrieve(question, language)
+        return similar_results, self.stream_answer(
+            question, language, similar_results, stats
+        )
+
+    def astream_answer(
+        self,
+        question: str,
+        language: str,
+        similar_results: List[Dict],
+        stats: Optional[Dict[str, float]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        검색 결과를 바탕으로 답변을 토큰 단위로 비동기 스트리밍
+
+        (토큰 스트림 병합은 스레드 기반이므로 비동기 경로에서는 병합하지 않음)
+        """
+        decision = self._decide(similar_results)
+        if decision.answer is not None:
+            _record_skipped_stats(stats)
+            return _aiter_once(decision.answer)
+
+        return self.llm_chain.astream_response(
+            question,
+            decision.results,
+            self.prompt_language(language, decision.results),
+            stats=stats,
+        )
+
+    def _decide(self, similar_results: List[Dict]) -> GateDecision:
+        """게이트 결정 후 결정별 횟수와 생략된 LLM 호출 수 기록"""
+        decision = self.gate.decide(similar_results)
+        metrics.increment("gate.decisions")
+        metrics.increment(f"gate.{decision.action}")
+        if decision.answer is not None:
+            metrics.increment("gate.llm_calls_avoided")
+        return decision
+
+    def _get_vector_store(self, language: str) -> "VectorStore":
+        if language not in self.vector_stores:
+            raise ValueError(f"지원하지 않는 언어입니다: {language}")
+        return self.vector_stores[language]
+
+    def _coalesced(self, flight: SingleFlight, key: Hashable, fn: Callable):
+        return flight.do(key, fn) if self.coalesce else fn()
+
+    async def _acoalesced(self, flight: SingleFlight, key: Hashable, fn: Callable):
+        return await flight.ado(key, fn) if self.coalesce else await fn()
+
+
+def _record_skipped_stats(stats: Optional[Dict[str, float]]):
+    # LLM을 호출하지 않은 답변은 즉시 완료된 것으로 기록
+    if stats is not None:
+        stats.update({"time_to_first_token": 0.0, "total_time": 0.0})
+
+
+async def _aiter_once(text: str) -> AsyncIterator[str]:
+    yield text
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+OVERLOADED_MESSAGE = "서버가 과부하 상태입니다. 잠시 후 다시 시도하세요."
+
+
+class ServiceOverloaded(Exception):
+    """서비스가 백프레셔로 요청을 거절함 (HTTP 503)"""
+
+
+class QAServiceClient:
+    """
+    QA HTTP 서비스(server.py) 클라이언트
+
+    QAService와 같은 인터페이스를 제공하여 Streamlit UI가 로컬 파이프라인 대신
+    원격 서비스를 그대로 사용할 수 있도록 함
+    """
+
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        """
+        Args:
+            base_url: 서비스 주소 (예: http://localhost:8000)
+            timeout: 요청 타임아웃(초)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # 연결 재사용을 위해 세션 유지
+        self.session = requests.Session()
+
+    @property
+    def languages(self) -> List[str]:
+        return self._get("/healthz")["languages"]
+
+    def retrieve(self, question: str, language: str) -> List[Dict]:
+        """유사 질문 검색"""
+        payload = {"question": question, "language": language}
+        return self._post("/v1/search", payload)["results"]
+
+    def process_question(self, question: str, language: str) -> Tuple[List[Dict], str]:
+        """검색 후 답변 생성"""
+        payload = {"question": question, "language": language}
+        response = self._post("/v1/answer", payload)
+        return response["results"], response["answer"]
+
+    async def aprocess_question(
+        self, question: str, language: str
+    ) -> Tuple[List[Dict], str]:
+        """검색 후 답변 생성 (이벤트 루프를 막지 않도록 스레드에서 요청)"""
+        return await asyncio.to_thread(self.process_question, question, language)
+
+    def process_batch(self, items: List[Dict[str, str]]) -> List[Dict]:
+        """
+        여러 질문을 한 번의 요청으로 처리
+
+        Args:
+            items: {"question", "language"[, "mode"]} 딕셔너리 리스트
+        Returns:
+            질문별 {"results", "answer"} 또는 {"error"} 딕셔너리 리스트
+        """
+        return self._post("/v1/batch", {"items": items})["items"]
+
+    def retrieve_and_stream(
+        self,
+        question: str,
+        language: str,
+        stats: Optional[Dict[str, float]] = None,
+    ) -> Tuple[List[Dict], Iterator[str]]:
+        """
+        검색 결과와 답변 토큰 스트림을 한 번의 요청으로 받기
+
+        서버가 스트림 첫 이벤트로 보내는 검색 결과를 사용하므로 /v1/search를
+        따로 호출하지 않는다 (질문 임베딩과 검색이 한 번만 수행됨).
+
+        Args:
+            stats: 서버가 보고한 time_to_first_token, total_time을 기록할 딕셔너리
+        Returns:
+            (유사 질문 결과 리스트, 답변 토큰 이터레이터)
+        """
+        response = self._open_stream(question, language)
+        try:
+            lines = response.iter_lines()
+            results = []
+            for line in lines:
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["type"] == "results":
+                    results = event["results"]
+                    break
+        except BaseException:
+            response.close()
+            raise
+        return results, self._read_tokens(response, lines, stats)
+
+    def stream_answer(
+        self,
+        question: str,
+        language: str,
+        similar_results: List[Dict],
+        stats: Optional[Dict[str, float]] = None,
+    ) -> Iterator[str]:
+        """
+        답변을 토큰 단위로 스트리밍
+
+        서버는 클라이언트가 보낸 결과를 신뢰하지 않고 컨텍스트를 직접 검색하므로
+        similar_results는 전송하지 않는다 (QAService와 같은 인터페이스 유지용).
+
+        Args:
+            stats: 서버가 보고한 time_to_first_token, total_time을 기록할 딕셔너리
+        """
+        response = self._open_stream(question, language)
+        return self._read_tokens(response, response.iter_lines(), stats)
+
+    def _open_stream(self, question: str, language: str) -> requests.Response:
+        payload = {"question": question, "language": language}
+        response = self.session.post(
+            f"{self.base_url}/v1/answer/stream",
+            json=payload,
+            stream=True,
+            timeout=self.timeout,
+        )
+        try:
+            _raise_for_status(response)
+        except BaseException:
+            response.close()
+            raise
+        return response
+
+    @staticmethod
+    def _read_tokens(
+        response: requests.Response,
+        lines: Iterator[bytes],
+        stats: Optional[Dict[str, float]],
+    ) -> Iterator[str]:
+        with response:
+            for line in lines:
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["type"] == "token":
+                    yield event["text"]
+                elif event["type"] == "done" and stats is not None:
+                    stats.update(event["stats"])
+
+    def _get(self, path: str) -> Dict:
+        response = self.session.get(f"{self.base_url}{path}", timeout=self.timeout)
+        _raise_for_status(response)
+        return response.json()
+
+    def _post(self, path: str, payload: Dict) -> Dict:
+        response = self.session.post(
+            f"{self.base_url}{path}", json=payload, timeout=self.timeout
+        )
+        _raise_for_status(response)
+        return response.json()
+
+
+def _raise_for_status(response: requests.Response):
+    """503(과부하)은 ServiceOverloaded로, 그 외 오류 상태는 HTTPError로 변환"""
+    if response.status_code == 503:
+        raise ServiceOverloaded(OVERLOADED_MESSAGE)
+    response.raise_for_status()
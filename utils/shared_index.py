@@ -0,0 +1,268 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.compact_corpus import CompactCorpus
+from utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows - 워커 간 내보내기 잠금 없이 동작
+    fcntl = None
+
+# 공유 메모리 파일시스템(tmpfs)이 있으면 그곳에 두어 모든 워커가 같은 페이지를 공유
+DEFAULT_SHARED_DIR = os.getenv(
+    "QA_SHARED_INDEX_DIR",
+    "/dev/shm/qa_index" if os.path.isdir("/dev/shm") else ".shared_index",
+)
+
+FORMAT_VERSION = 2
+
+
+def shared_export_path(shared_dir: str, lang: str, index_path: str) -> str:
+    """
+    원본 인덱스별 공유 인덱스 경로
+
+    같은 호스트의 다른 배포나 임시 인덱스를 만드는 벤치마크가 서로의 내보내기를
+    덮어쓰지 않도록 원본 디렉터리의 절대 경로 해시를 이름에 포함한다.
+    """
+    digest = hashlib.sha1(os.path.abspath(index_path).encode("utf-8")).hexdigest()
+    return os.path.join(shared_dir, f"faiss_index_{lang}-{digest[:12]}")
+
+
+def export_vector_store(
+    vector_store, target_dir: str, source_path: Optional[str] = None
+) -> Dict:
+    """
+    VectorStore를 워커들이 mmap으로 공유할 수 있는 평면 파일로 내보내기
+
+    생성 파일:
+        vectors.npy        (n, dim) float32 벡터
+        norms.npy          (n,) 벡터 제곱 노름 (검색 시 재계산하지 않음)
+        corpus.bin         인덱스 위치 순서로 정렬된 CompactCorpus 버퍼
+        corpus_offsets.npy CompactCorpus 오프셋 배열
+        manifest.json      레코드 수, 차원, 형식 버전, 원본 인덱스 경로
+
+    Args:
+        vector_store: FAISS(IndexFlatL2)를 로드한 VectorStore
+        target_dir: 내보낼 디렉터리 (임시 디렉터리에 쓴 뒤 원자적으로 교체)
+        source_path: 원본 faiss_index_{lang} 디렉터리 (manifest에 절대 경로로 기록)
+    Returns:
+        manifest 딕셔너리
+    """
+    import faiss
+
+    vectorstore = vector_store.vectorstore
+    index = vectorstore.index
+    if index.metric_type != faiss.METRIC_L2:
+        raise ValueError("L2 거리 인덱스만 공유 메모리로 내보낼 수 있습니다.")
+
+    with metrics.span("index.shared_export"):
+        vectors = index.reconstruct_n(0, index.ntotal).astype(np.float32)
+        norms = np.einsum("ij,ij->i", vectors, vectors)
+
+        # 공유 인덱스에서는 인덱스 위치가 곧 문서 ID가 되도록 말뭉치를 정렬
+        metadatas = [
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[i]).metadata
+            for i in range(index.ntotal)
+        ]
+        if vector_store.corpus is not None:
+            doc_ids = [metadata["doc_id"] for metadata in metadatas]
+            corpus = vector_store.corpus
+            if doc_ids != list(range(len(corpus))):
+                corpus = corpus.take(doc_ids)
+        else:
+            # 말뭉치 도입 이전 인덱스는 메타데이터에서 말뭉치를 만듦
+            corpus = CompactCorpus.from_records(
+                (m["question_title"], m["clean_answer"], m["question_link"])
+                for m in metadatas
+            )
+
+        manifest = {
+            "version": FORMAT_VERSION,
+            "count": int(index.ntotal),
+            "dimension": int(index.d),
+            "created_at": time.time(),
+            "source": os.path.abspath(source_path) if source_path else None,
+        }
+
+        parent = os.path.dirname(os.path.abspath(target_dir))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=".export-")
+        try:
+            np.save(os.path.join(staging, "vectors.npy"), vectors)
+            np.save(os.path.join(staging, "norms.npy"), norms)
+            corpus.save(staging)
+            with open(os.path.join(staging, "manifest.json"), "w") as f:
+                json.dump(manifest, f)
+
+            # 이미 붙어 있는 워커는 기존 파일의 mmap을 계속 사용 (삭제되어도 유효)
+            if os.path.exists(target_dir):
+                shutil.rmtree(target_dir)
+            os.rename(staging, target_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    return manifest
+
+
+def is_export_current(shared_path: str, source_path: Optional[str] = None) -> bool:
+    """공유 인덱스가 존재하고 같은 원본 FAISS 인덱스에서 내보낸 최신 상태인지 확인"""
+    manifest_path = os.path.join(shared_path, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != FORMAT_VERSION:
+        return False
+    if source_path and manifest.get("source") != os.path.abspath(source_path):
+        return False
+    if source_path and os.path.exists(source_path):
+        source_mtime = max(
+            os.path.getmtime(os.path.join(source_path, name))
+            for name in os.listdir(source_path)
+        )
+        return os.path.getmtime(manifest_path) >= source_mtime
+    return True
+
+
+class SharedVectorStore:
+    """
+    공유 메모리에 매핑된 읽기 전용 벡터 인덱스
+
+    VectorStore와 같은 검색 인터페이스를 제공한다. 벡터와 메타데이터는 mmap으로
+    매핑되므로 같은 호스트의 모든 워커가 한 벌의 물리 메모리를 공유하고,
+    검색은 IndexFlatL2와 같은 제곱 L2 거리로 전체 탐색한다.
+    """
+
+    def __init__(self, embeddings, path: str):
+        """
+        Args:
+            embeddings: 쿼리 임베딩에 사용할 임베딩 모델
+            path: export_vector_store로 내보낸 디렉터리
+        """
+        self.embeddings = embeddings
+        self.path = path
+
+        start = time.perf_counter()
+        with metrics.span("index.shared_attach"):
+            with open(os.path.join(path, "manifest.json")) as f:
+                self.manifest = json.load(f)
+            self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+            self.norms = np.load(os.path.join(path, "norms.npy"), mmap_mode="r")
+            self.corpus = CompactCorpus.load(path, use_mmap=True)
+        self.attach_seconds = time.perf_counter() - start
+
+    def __len__(self) -> int:
+        return self.manifest["count"]
+
+    def get_similar_questions(self, query: str, k: int = 3) -> List[Dict]:
+        """
+        유사한 질문 검색 및 결과 포맷팅
+
+        Args:
+            query: 사용자 질문
+            k: 반환할 결과 수
+        Returns:
+            유사 질문, 답변, 링크, 유사도 점수를 포함한 결과 리스트
+        """
+        with metrics.span("retrieval"):
+            with metrics.span("retrieval.embed_query"):
+                embedding = self.embeddings.embed_query(query)
+
+            with metrics.span("retrieval.faiss_search"):
+                return self.search_by_vector(embedding, k)
+
+    async def aget_similar_questions(self, query: str, k: int = 3) -> List[Dict]:
+        """유사한 질문 비동기 검색 (전체 탐색은 스레드에서 실행)"""
+        with metrics.span("retrieval"):
+            with metrics.span("retrieval.embed_query"):
+                embedding = await self.embeddings.aembed_query(query)
+
+            with metrics.span("retrieval.faiss_search"):
+                return await asyncio.to_thread(self.search_by_vector, embedding, k)
+
+    def search_by_vector(self, embedding: List[float], k: int = 3) -> List[Dict]:
+        """임베딩 벡터로 가장 가까운 k개 레코드 검색"""
+        count = len(self)
+        if count == 0:
+            return []
+        k = min(k, count)
+
+        query = np.asarray(embedding, dtype=np.float32)
+        # ||x - q||^2 = ||x||^2 - 2 x·q + ||q||^2
+        distances = self.norms - 2.0 * (self.vectors @ query) + float(query @ query)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [self.corpus.result(int(i), distances[i]) for i in top]
+
+    def neighbor_distance_scale(self, sample_size: int = 128, seed: int = 0) -> float:
+        """
+        저장된 벡터 표본의 최근접 이웃 거리 중앙값 (언어별 점수 보정에 사용)
+
+        Args:
+            sample_size: 표본으로 사용할 벡터 수
+            seed: 표본 추출 시드
+        Returns:
+            최근접 이웃 제곱 L2 거리의 중앙값 (벡터가 2개 미만이면 1.0)
+        """
+        count = len(self)
+        if count < 2:
+            return 1.0
+        positions = np.random.default_rng(seed).choice(
+            count, size=min(sample_size, count), replace=False
+        )
+        samples = np.asarray(self.vectors[positions])
+        distances = (
+            self.norms[None, :]
+            - 2.0 * (samples @ self.vectors.T)
+            + self.norms[positions][:, None]
+        )
+        # 자기 자신과의 거리는 제외
+        distances[np.arange(len(positions)), positions] = np.inf
+        return float(np.median(distances.min(axis=1)))
+
+
+def attach_shared_store(
+    embeddings,
+    lang: str,
+    index_path: str,
+    shared_dir: str = DEFAULT_SHARED_DIR,
+    load_index=None,
+) -> SharedVectorStore:
+    """
+    언어별 공유 인덱스에 연결 (없거나 오래되었으면 호스트에서 한 워커만 내보내기)
+
+    Args:
+        embeddings: 임베딩 모델
+        lang: 프로그래밍 언어
+        index_path: 원본 faiss_index_{lang} 디렉터리
+        shared_dir: 공유 인덱스를 둘 디렉터리
+        load_index: 원본 인덱스를 로드(없으면 생성)하여 VectorStore를 반환하는 함수
+    Returns:
+        SharedVectorStore
+    """
+    shared_path = shared_export_path(shared_dir, lang, index_path)
+    if not is_export_current(shared_path, index_path):
+        os.makedirs(shared_dir, exist_ok=True)
+        # 여러 워커가 동시에 시작해도 내보내기는 한 번만 수행
+        lock_path = os.path.join(shared_dir, f".{os.path.basename(shared_path)}.lock")
+        with open(lock_path, "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if not is_export_current(shared_path, index_path):
+                    export_vector_store(load_index(), shared_path, index_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    return SharedVectorStore(embeddings, shared_path)
@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Tuple
+
+from utils.metrics import metrics
+
+
+def normalize_question(question: str) -> str:
+    """
+    동일 질문 판별을 위한 정규화 (유니코드 정규화, 대소문자/공백/끝 문장부호 무시)
+
+    Args:
+        question: 사용자 질문
+    Returns:
+        정규화된 질문 문자열
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    return " ".join(text.split()).rstrip("?!.。？！ ")
+
+
+def question_key(language: str, question: str) -> Tuple[str, str]:
+    """(언어, 정규화된 질문) 형태의 single-flight 키 생성"""
+    return language, normalize_question(question)
+
+
+class _Call:
+    """진행 중인 단일 계산"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    """진행 중인 비동기 계산 (별도 태스크로 실행하고 대기 중인 요청 수를 추적)"""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class _StreamCall:
+    """진행 중인 스트리밍 계산 (생성된 청크를 모든 구독자가 재생)"""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.finished = False
+        self.error = None
+        self.condition = threading.Condition()
+
+
+class SingleFlight:
+    """
+    동일한 키의 요청이 동시에 들어오면 하나만 실제로 계산하고
+    나머지는 진행 중인 계산 결과를 기다리도록 하는 프로세스 전역 요청 병합기
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 지표 이름에 사용할 식별자
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._streams: Dict[Hashable, _StreamCall] = {}
+        self._tasks: Dict[Tuple[int, Hashable], _AsyncCall] = {}
+        self._calls = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        키별로 fn을 한 번만 실행하고 동시에 들어온 요청은 그 결과를 공유
+
+        Args:
+            key: 요청 식별 키
+            fn: 실제 계산 함수
+        Returns:
+            fn의 반환값 (실패 시 대기 중인 모든 요청에 같은 예외 전파)
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+            self._record(leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        do의 비동기 버전 (같은 이벤트 루프 안에서 동일 키의 코루틴을 병합)
+
+        계산은 최초 요청과 분리된 태스크로 실행되므로, 한 요청이 취소되어도
+        같은 계산을 기다리는 다른 요청은 결과를 그대로 받는다. 대기 중인 요청이
+        모두 취소되면 계산도 취소한다.
+
+        Args:
+            key: 요청 식별 키
+            fn: 코루틴을 반환하는 함수
+        Returns:
+            코루틴의 결과 (실패 시 대기 중인 모든 요청에 같은 예외 전파)
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+
+        with self._lock:
+            call = self._tasks.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._tasks[flight_key] = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(
+                    lambda _: self._forget_task(flight_key, call)
+                )
+            call.waiters += 1
+            self._record(leader)
+
+        try:
+            # 대기 중인 요청이 취소되어도 공유 계산은 취소되지 않도록 보호
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                if call.waiters == 0 and not call.task.done():
+                    # 결과를 기다리는 요청이 모두 취소되었으면 계산 중단
+                    if self._tasks.get(flight_key) is call:
+                        del self._tasks[flight_key]
+                    call.task.cancel()
+
+    def stream(self, key: Hashable, fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        토큰 스트림을 병합: 최초 요청이 백그라운드에서 스트림을 생성하고,
+        동시에 들어온 요청은 이미 생성된 청크부터 재생한 뒤 이어서 수신
+
+        Args:
+            key: 요청 식별 키
+            fn: 토큰 이터레이터를 반환하는 함수
+        Returns:
+            토큰 문자열 이터레이터
+        """
+        with self._lock:
+            call = self._streams.get(key)
+            leader = call is None
+            if leader:
+                call = self._streams[key] = _StreamCall()
+            self._record(leader)
+
+        if leader:
+            # 구독자가 중간에 떠나도 생성은 끝까지 진행되도록 별도 스레드에서 실행
+            threading.Thread(
+                target=self._produce, args=(key, call, fn), daemon=True
+            ).start()
+
+        return self._follow(call)
+
+    def stats(self) -> Dict[str, int]:
+        """전체 요청 수, 실제 실행 수, 병합된 요청 수 반환"""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._calls - self._coalesced,
+                "coalesced": self._coalesced,
+            }
+
+    def _record(self, leader: bool):
+        # self._lock을 잡은 상태에서 호출
+        self._calls += 1
+        metrics.increment(f"single_flight.{self.name}.calls")
+        if not leader:
+            self._coalesced += 1
+            metrics.increment(f"single_flight.{self.name}.coalesced")
+
+    def _forget_task(self, flight_key: Tuple[int, Hashable], call: _AsyncCall):
+        # 같은 키로 새 계산이 시작되었을 수 있으므로 자신의 항목만 제거
+        with self._lock:
+            if self._tasks.get(flight_key) is call:
+                del self._tasks[flight_key]
+
+    def _produce(
+        self, key: Hashable, call: _StreamCall, fn: Callable[[], Iterator[str]]
+    ):
+        try:
+            for chunk in fn():
+                with call.condition:
+                    call.chunks.append(chunk)
+                    call.condition.notify_all()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._streams[key]
+            with call.condition:
+                call.finished = True
+                call.condition.notify_all()
+
+    @staticmethod
+    def _follow(call: _StreamCall) -> Iterator[str]:
+        index = 0
+        while True:
+            with call.condition:
+                while index >= len(call.chunks) and not call.finished:
+                    call.condition.wait()
+                pending = call.chunks[index:]
+                finished = call.finished
+
+            yield from pending
+            index += len(pending)
+
+            if finished and index >= len(call.chunks):
+                if call.error is not None:
+                    raise call.error
+                return
+
+
+# 프로세스 전역 인스턴스 (Streamlit 세션 간 공유)
+retrieval_flight = SingleFlight("retrieval")
+answer_flight = SingleFlight("answer")
@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import pandas as pd
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# 합성 코퍼스 생성을 위한 언어별 주제 어휘
+_TOPICS = {
+    "c#": (
+        "LINQ|async|await|Task|string|List|Dictionary|delegate|event|generic|"
+        "nullable|struct|interface|Entity Framework|ASP.NET|record|Span|IEnumerable"
+    ).split("|"),
+    "javascript": (
+        "Promise|async|closure|prototype|array|map|fetch|DOM|event|module|this|"
+        "arrow function|JSON|regex|setTimeout|object|class|Node.js"
+    ).split("|"),
+    "java": (
+        "Stream|Optional|HashMap|ArrayList|thread|lambda|interface|generic|"
+        "exception|String|JVM|Spring|record|enum|CompletableFuture|synchronized"
+    ).split("|"),
+}
+_VERBS = (
+    "sort|convert|iterate over|compare|parse|filter|serialize|merge|cancel|test|"
+    "debug|optimize"
+).split("|")
+_WORDS = (
+    "the value method returns instead you can use this because example call "
+    "result type when list"
+).split()
+
+
+class StubEmbeddings(Embeddings):
+    """
+    외부 API 없이 결정적인 벡터를 반환하는 임베딩 (부하 테스트/벤치마크용)
+
+    토큰을 해싱하여 차원에 누적하므로 단어가 겹치는 텍스트는 가까운 벡터를 가짐
+    """
+
+    def __init__(
+        self, dimension: int = 256, latency: float = 0.0, per_text_latency: float = 0.0
+    ):
+        """
+        Args:
+            dimension: 임베딩 차원
+            latency: 호출 1회당 지연 시간(초)
+            per_text_latency: 텍스트 1개당 추가 지연 시간(초)
+        """
+        self.dimension = dimension
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency + self.per_text_latency * len(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency + self.per_text_latency)
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency + self.per_text_latency * len(texts))
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency + self.per_text_latency)
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in re.findall(r"\w+", text.casefold()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest, "little")
+            vector[bucket % self.dimension] += 1.0 if (bucket >> 40) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+
+class StubChatModel(BaseChatModel):
+    """
+    프롬프트에 따라 결정적인 답변을 지연 시간과 함께 반환하는 채팅 모델 (부하 테스트용)
+    """
+
+    first_token_latency: float = 0.2
+    token_latency: float = 0.01
+    num_tokens: int = 40
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        return [f"{rng.choice(_WORDS)} " for _ in range(self.num_tokens)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens = self._tokens(messages)
+        time.sleep(self.first_token_latency + self.token_latency * len(tokens))
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens = self._tokens(messages)
+        await asyncio.sleep(self.first_token_latency + self.token_latency * len(tokens))
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.first_token_latency)
+        for token in self._tokens(messages):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            time.sleep(self.token_latency)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.first_token_latency)
+        for token in self._tokens(messages):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            await asyncio.sleep(self.token_latency)
+
+
+def make_synthetic_qa_frame(language: str, size: int, seed: int = 0) -> pd.DataFrame:
+    """
+    스택오버플로우 CSV와 같은 형태의 합성 데이터 생성 (HTML 답변 포함)
+
+    Args:
+        language: 프로그래밍 언어 (주제 어휘 선택에 사용)
+        size: 생성할 질문 수
+        seed: 난수 시드
+    Returns:
+        question_title, question_link, accepted_answer_body 컬럼의 DataFrame
+    """
+    rng = random.Random(f"{language}-{seed}")
+    topics = _TOPICS.get(language, _TOPICS["c#"])
+    rows = []
+
+    for idx in range(size):
+        topic, other = rng.sample(topics, 2)
+        title = f"How to {rng.choice(_VERBS)} {topic} with {other} in {language}?"
+        sentences = [
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 20)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        receiver = topic.replace(" ", "")
+        code = "\n".join(
+            f"var {rng.choice(_WORDS)}{i} = {receiver}.{rng.choice(_VERBS)[:4]}();"
+            for i in range(rng.randint(1, 6))
+        )
+        body = "".join(
+            f"<p>{sentence} <code>{topic}</code></p>" for sentence in sentences
+        )
+        body += f"<pre><code>{code}</code></pre>"
+        if rng.random() < 0.5:
+            body += "<ul>" + "".join(
+                f"<li>{rng.choice(_WORDS)} {other}</li>" for _ in range(3)
+            ) + "</ul>"
+        if rng.random() < 0.3:
+            body += (
+                f'<p>See <a href="https://example.com/{idx}">the docs</a>.</p>'
+                f"<blockquote>{topic} {rng.choice(_WORDS)}</blockquote>"
+            )
+        rows.append(
+            {
+                "question_title": title,
+                "question_link": f"https://stackoverflow.com/questions/{idx}",
+                "accepted_answer_body": body,
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+def make_question_trace(
+    frames: Dict[str, pd.DataFrame], size: int, seed: int = 0, repeat_ratio: float = 0.2
+) -> List[Dict[str, str]]:
+    """
+    합성 데이터의 질문 제목을 변형하여 재생 가능한 질문 트레이스 생성
+
+    Args:
+        frames: 언어별 합성 DataFrame
+        size: 트레이스 길이
+        seed: 난수 시드
+        repeat_ratio: 직전 질문을 그대로 반복할 비율 (동시 동일 질문 시뮬레이션)
+    Returns:
+        {"question": ..., "language": ...} 딕셔너리 리스트
+    """
+    rng = random.Random(seed)
+    languages = sorted(frames)
+    trace = []
+
+    for _ in range(size):
+        if trace and rng.random() < repeat_ratio:
+            trace.append(dict(trace[-1]))
+            continue
+        language = rng.choice(languages)
+        title = rng.choice(list(frames[language]["question_title"]))
+        words = title.rstrip("?").split()
+        # 일부 단어를 빼서 원문과 완전히 같지 않은 질문으로 변형
+        kept = [w for w in words if rng.random() > 0.2] or words
+        trace.append({"question": " ".join(kept) + "?", "language": language})
+
+    return trace
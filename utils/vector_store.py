@@ -1,10 +1,17 @@
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from langchain.schema import Document
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 
+from utils.compact_corpus import CompactCorpus
+from utils.data_loader import load_stackoverflow_corpus
+from utils.languages import LANGUAGES
+from utils.metrics import metrics
+
 
 class VectorStore:
     def __init__(self, embeddings: OpenAIEmbeddings):
@@ -16,33 +23,47 @@ class VectorStore:
         """
         self.embeddings = embeddings
         self.vectorstore = None
+        # 질문/답변/링크 본문 (말뭉치 도입 이전에 저장된 인덱스는 None)
+        self.corpus: Optional[CompactCorpus] = None
 
-    def create_vectorstore(self, df: pd.DataFrame) -> FAISS:
+    def create_vectorstore(self, data: Union[CompactCorpus, pd.DataFrame]) -> FAISS:
         """
-        DataFrame으로부터 FAISS 벡터 스토어 생성
+        말뭉치로부터 FAISS 벡터 스토어 생성
+
+        docstore에는 정수 문서 ID만 저장하고, 질문/답변/링크는 CompactCorpus에서 조회
 
         Args:
-            df: 전처리된 DataFrame (question_title, question_link, clean_answer 포함)
+            data: CompactCorpus 또는 전처리된 DataFrame
+                (question_title, question_link, clean_answer 포함)
         Returns:
             FAISS 벡터 스토어
         """
-        documents = []
+        with metrics.span("index.build"):
+            corpus = data
+            if not isinstance(data, CompactCorpus):
+                with metrics.span("index.build_corpus"):
+                    corpus = CompactCorpus.from_frame(data)
 
-        for idx, row in df.iterrows():
-            # 검색을 위한 텍스트는 질문과 답변을 결합
-            text_content = f"{row['question_title']}\n{row['clean_answer']}"
+            # 문서 임베딩과 FAISS 인덱스 구성을 단계별로 나누어 수행
+            vectors = self.embed_corpus(corpus)
+            return self.build_index(corpus, vectors)
 
-            # 메타데이터에 모든 필요한 정보 저장
-            metadata = {
-                "question_title": row["question_title"],
-                "clean_answer": row["clean_answer"],
-                "question_link": row["question_link"],
-            }
-
-            doc = Document(page_content=text_content, metadata=metadata)
-            documents.append(doc)
+    def embed_corpus(self, corpus: CompactCorpus) -> List[List[float]]:
+        """말뭉치의 검색용 텍스트(질문 + 답변) 임베딩"""
+        with metrics.span("index.embed_documents"):
+            return self.embeddings.embed_documents(
+                [corpus.search_text(doc_id) for doc_id in range(len(corpus))]
+            )
 
-        self.vectorstore = FAISS.from_documents(documents, self.embeddings)
+    def build_index(self, corpus: CompactCorpus, vectors: List[List[float]]) -> FAISS:
+        """임베딩 벡터로 FAISS 인덱스 구성 (docstore에는 문서 ID만 저장)"""
+        with metrics.span("index.faiss_build"):
+            self.vectorstore = FAISS.from_embeddings(
+                [("", vector) for vector in vectors],
+                self.embeddings,
+                metadatas=[{"doc_id": doc_id} for doc_id in range(len(corpus))],
+            )
+        self.corpus = corpus
         return self.vectorstore
 
     def get_similar_questions(self, query: str, k: int = 3) -> List[Dict]:
@@ -58,17 +79,99 @@ class VectorStore:
         if not self.vectorstore:
             raise ValueError("Vector store가 초기화되지 않았습니다.")
 
-        # 유사도 검색 수행
-        docs_with_scores = self.vectorstore.similarity_search_with_score(query, k=k)
+        with metrics.span("retrieval"):
+            # 쿼리 임베딩과 FAISS 검색을 단계별로 나누어 수행
+            with metrics.span("retrieval.embed_query"):
+                embedding = self.embeddings.embed_query(query)
+
+            with metrics.span("retrieval.faiss_search"):
+                return self.search_by_vector(embedding, k)
+
+    def search_by_vector(self, embedding: List[float], k: int = 3) -> List[Dict]:
+        """
+        이미 계산된 쿼리 임베딩으로 유사 질문 검색 (여러 인덱스에 같은 벡터를 재사용)
+
+        Args:
+            embedding: 쿼리 임베딩 벡터
+            k: 반환할 결과 수
+        Returns:
+            유사 질문, 답변, 링크, 유사도 점수를 포함한 결과 리스트
+        """
+        if not self.vectorstore:
+            raise ValueError("Vector store가 초기화되지 않았습니다.")
+
+        docs_with_scores = self.vectorstore.similarity_search_with_score_by_vector(
+            embedding, k=k
+        )
+        return self._format_results(docs_with_scores)
+
+    def neighbor_distance_scale(self, sample_size: int = 128, seed: int = 0) -> float:
+        """
+        저장된 벡터 표본의 최근접 이웃 거리 중앙값 (언어별 점수 보정에 사용)
+
+        Args:
+            sample_size: 표본으로 사용할 벡터 수
+            seed: 표본 추출 시드
+        Returns:
+            최근접 이웃 제곱 L2 거리의 중앙값 (벡터가 2개 미만이면 1.0)
+        """
+        if not self.vectorstore:
+            raise ValueError("Vector store가 초기화되지 않았습니다.")
+
+        index = self.vectorstore.index
+        if index.ntotal < 2:
+            return 1.0
+        positions = np.random.default_rng(seed).choice(
+            index.ntotal, size=min(sample_size, index.ntotal), replace=False
+        )
+        samples = np.vstack([index.reconstruct(int(p)) for p in positions])
+        # 첫 번째 이웃은 자기 자신이므로 두 번째 이웃까지의 거리를 사용
+        distances, _ = index.search(samples, 2)
+        return float(np.median(distances[:, 1]))
+
+    async def aget_similar_questions(self, query: str, k: int = 3) -> List[Dict]:
+        """
+        유사한 질문 비동기 검색 (쿼리 임베딩과 FAISS 검색이 이벤트 루프를 막지 않음)
+
+        Args:
+            query: 사용자 질문
+            k: 반환할 결과 수
+        Returns:
+            유사 질문, 답변, 링크, 유사도 점수를 포함한 결과 리스트
+        """
+        if not self.vectorstore:
+            raise ValueError("Vector store가 초기화되지 않았습니다.")
+
+        with metrics.span("retrieval"):
+            with metrics.span("retrieval.embed_query"):
+                embedding = await self.embeddings.aembed_query(query)
+
+            with metrics.span("retrieval.faiss_search"):
+                docs_with_scores = (
+                    await self.vectorstore.asimilarity_search_with_score_by_vector(
+                        embedding, k=k
+                    )
+                )
+            return self._format_results(docs_with_scores)
+
+    def _format_results(
+        self, docs_with_scores: List[Tuple[Document, float]]
+    ) -> List[Dict]:
+        """검색된 문서와 점수를 결과 딕셔너리 리스트로 변환"""
         results = []
 
         for doc, score in docs_with_scores:
+            if "doc_id" in doc.metadata:
+                results.append(self.corpus.result(doc.metadata["doc_id"], score))
+                continue
+
+            # 말뭉치 도입 이전 인덱스는 메타데이터에 본문이 저장되어 있음
             results.append(
                 {
                     "question": doc.metadata["question_title"],
                     "answer": doc.metadata["clean_answer"],
                     "link": doc.metadata["question_link"],
-                    "similarity_score": score,  # 유사도 점수 추가
+                    "similarity_score": float(score),  # 유사도 점수 추가
                 }
             )
 
@@ -77,13 +180,92 @@ class VectorStore:
     def save_vectorstore(self, path: str):
         """벡터 스토어를 로컬에 저장"""
         if self.vectorstore:
-            self.vectorstore.save_local(path)
+            with metrics.span("index.save"):
+                self.vectorstore.save_local(path)
+                if self.corpus is not None:
+                    self.corpus.save(path)
 
     def load_vectorstore(self, path: str) -> FAISS:
         """로컬에서 벡터 스토어 로드"""
-        self.vectorstore = FAISS.load_local(
-            path,
-            self.embeddings,
-            allow_dangerous_deserialization=True,  # 신뢰할 수 있는 로컬 데이터에 대해서만 사용
-        )
+        with metrics.span("index.load"):
+            self.vectorstore = FAISS.load_local(
+                path,
+                self.embeddings,
+                allow_dangerous_deserialization=True,  # 신뢰할 수 있는 로컬 데이터에 대해서만 사용
+            )
+            # 말뭉치 도입 이전에 저장된 인덱스는 메타데이터에서 본문을 읽음
+            self.corpus = None
+            if CompactCorpus.exists(path):
+                self.corpus = CompactCorpus.load(path)
+            elif self._stores_doc_ids():
+                raise FileNotFoundError(
+                    f"{path}에 말뭉치 파일(corpus.bin, corpus_offsets.npy)이 없습니다. "
+                    "인덱스 디렉터리를 삭제하고 다시 생성하세요."
+                )
         return self.vectorstore
+
+    def _stores_doc_ids(self) -> bool:
+        """docstore가 본문 대신 문서 ID만 저장하는 형식인지 확인"""
+        ids = self.vectorstore.index_to_docstore_id
+        if not ids:
+            return False
+        return "doc_id" in self.vectorstore.docstore.search(ids[0]).metadata
+
+
+def build_vector_stores(
+    embeddings: OpenAIEmbeddings,
+    languages: List[str] = LANGUAGES,
+    index_dir: str = ".",
+    data_dir: str = "data",
+    shared: Optional[bool] = None,
+    shared_dir: Optional[str] = None,
+) -> Dict[str, VectorStore]:
+    """
+    언어별 벡터 스토어 로드 (저장된 인덱스가 없으면 CSV에서 생성 후 저장)
+
+    Args:
+        embeddings: 임베딩 모델
+        languages: 로드할 언어 목록
+        index_dir: faiss_index_{lang} 디렉터리가 위치한 경로
+        data_dir: stackoverflow_{lang}_qa.csv 파일이 위치한 경로
+        shared: 호스트의 워커들이 공유하는 읽기 전용 인덱스에 연결할지 여부
+            (None이면 환경 변수 QA_SHARED_INDEX를 따름)
+        shared_dir: 공유 인덱스 디렉터리 (None이면 /dev/shm/qa_index)
+    Returns:
+        언어별 VectorStore (공유 모드에서는 SharedVectorStore) 딕셔너리
+    """
+    if shared is None:
+        shared = os.getenv("QA_SHARED_INDEX", "false").lower() in ("1", "true", "yes")
+
+    vector_stores = {}
+
+    for lang in languages:
+        vector_store = VectorStore(embeddings)
+        index_path = os.path.join(index_dir, f"faiss_index_{lang}")
+        csv_path = os.path.join(data_dir, f"stackoverflow_{lang}_qa.csv")
+
+        def load_index() -> VectorStore:
+            # 저장된 벡터 스토어가 있으면 로드
+            if os.path.exists(index_path):
+                vector_store.load_vectorstore(index_path)
+            else:
+                # 데이터 로드 및 벡터 스토어 생성
+                corpus = load_stackoverflow_corpus(csv_path)
+                vector_store.create_vectorstore(corpus)
+                vector_store.save_vectorstore(index_path)
+            return vector_store
+
+        if shared:
+            from utils.shared_index import DEFAULT_SHARED_DIR, attach_shared_store
+
+            vector_stores[lang] = attach_shared_store(
+                embeddings,
+                lang,
+                index_path,
+                shared_dir or DEFAULT_SHARED_DIR,
+                load_index=load_index,
+            )
+        else:
+            vector_stores[lang] = load_index()
+
+    return vector_stores